@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RepoSpecsDto:
+    file_count: int = 200
+    dir_depth: int = 3
+    file_lines: int = 60
+    msg_density: float = 0.1  # Share of the generated statements that are log calls or raises
+    private_import_density: float = 0.2  # Share of the files importing a private module of another package
+    ignore_rule_count: int = 20
+    just_file_count: int = 20
+    compose_group_count: int = 5
+    compose_delay: float = 0.0  # Seconds the stub compose binary sleeps per call, to mimic a real engine
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class ImportProfileDto:
+    seconds: float  # Import time on top of a bare interpreter
+    modules: frozenset[str]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class Baseline:
+    """Stored timings that later benchmark runs are compared against."""
+
+    def __init__(self, path: Path, threshold: float = 0.2, min_delta: float = 0.005) -> None:
+        self._path = path
+        self._threshold = threshold  # Relative slowdown tolerated before a phase counts as regressed
+        self._min_delta = min_delta  # Seconds, so the noise of very short phases never fails a run
+
+    def load(self) -> dict[str, dict[str, float]]:
+        if not self._path.is_file():
+            return {}
+
+        return json.loads(self._path.read_text())
+
+    def save(self, results: dict[str, dict[str, float]]) -> None:
+        self._path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+    def find_regressions(self, results: dict[str, dict[str, float]]) -> list[str]:
+        regressions = []
+        baseline = self.load()
+
+        for size, timings in sorted(results.items()):
+            for phase, seconds in sorted(timings.items()):
+                base_seconds = baseline.get(size, {}).get(phase)
+                if base_seconds is None:
+                    continue
+
+                delta = seconds - base_seconds
+                if delta > self._min_delta and delta > base_seconds * self._threshold:
+                    regressions.append(
+                        f"{size}/{phase}: {base_seconds * 1000:.1f}ms -> {seconds * 1000:.1f}ms "
+                        f"(+{delta / base_seconds:.0%})"
+                    )
+
+        return regressions
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import ast
+import contextlib
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+import fixmate
+from benchmarks.synthetic_repo import SyntheticRepo
+from fixmate.dir_checker.dir_checker import DirChecker
+from fixmate.helpers.reporter import report_errors
+from fixmate.helpers.result_cache import CACHE_DIR_NAME
+from fixmate.helpers.tree_walker import TreeWalker
+from fixmate.just_indexer.just_indexer import JustIndexer
+from fixmate.python_checker.python_checker import PythonChecker
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from benchmarks._dto import RepoSpecsDto
+
+
+class BenchmarkRunner:
+    """Time each phase of every fixmate command against a generated repository.
+
+    Each phase runs `repeat` times and keeps its fastest run, which is the least disturbed by other processes.
+    """
+
+    def __init__(self, repeat: int = 3) -> None:
+        self._repeat = max(repeat, 1)
+        self._null_logger = logging.getLogger("benchmarks.null")
+        self._null_logger.addHandler(logging.NullHandler())
+        self._null_logger.propagate = False
+
+    def run(self, specs: RepoSpecsDto) -> dict[str, float]:
+        """Return the timings in seconds, keyed by `<command>.<phase>`."""
+        initial_cwd = Path.cwd()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            repo_dir = Path(temp_dir) / "repo"
+            repo_dir.mkdir()
+            engine_path = Path(temp_dir) / "bin" / "engine"
+            synthetic_repo = SyntheticRepo(specs)
+            synthetic_repo.generate(repo_dir)
+            synthetic_repo.write_compose_stub(engine_path)
+
+            # The checkers resolve their configs and report paths relative to the working directory
+            os.chdir(repo_dir)
+            try:
+                return {
+                    **self._time_python_checker(repo_dir),
+                    **self._time_dir_checker(repo_dir),
+                    **self._time_just_indexer(repo_dir),
+                    **self._time_compose_checker(engine_path),
+                }
+            finally:
+                os.chdir(initial_cwd)
+
+    def _time_python_checker(self, repo_dir: Path) -> dict[str, float]:
+        checker = PythonChecker(jobs=1, use_cache=False)
+        cached_checker = PythonChecker(jobs=1)
+        parallel_checker = PythonChecker(use_cache=False)
+        walker = TreeWalker(checker.should_check_dir)
+        file_abs_paths = [
+            dir_abs_path / file_name
+            for dir_abs_path, dir_snapshot, _ in walker.walk(repo_dir)
+            for file_name in sorted(dir_snapshot.file_names)
+            if checker.should_check_file(file_name)
+        ]
+        sources = [file_abs_path.read_bytes() for file_abs_path in file_abs_paths]
+        errors = [error for _, file_errors in checker.check_paths(file_abs_paths, repo_dir) for error in file_errors]
+        clear_cache = lambda: shutil.rmtree(repo_dir / CACHE_DIR_NAME, ignore_errors=True)  # noqa: E731
+
+        timings = {
+            "walk": self._measure(lambda: list(walker.walk(repo_dir))),
+            "read": self._measure(lambda: [file_abs_path.read_bytes() for file_abs_path in file_abs_paths]),
+            "parse": self._measure(lambda: [ast.parse(source) for source in sources]),
+            "check": self._measure(lambda: list(checker.check_paths(file_abs_paths, repo_dir))),
+            "check_parallel": self._measure(lambda: list(parallel_checker.check_paths(file_abs_paths, repo_dir))),
+            "cold_cache": self._measure(
+                lambda: list(cached_checker.check_paths(file_abs_paths, repo_dir)), setup=clear_cache
+            ),
+            "warm_cache": self._measure(lambda: list(cached_checker.check_paths(file_abs_paths, repo_dir))),
+            "report": self._measure(lambda: self._report(errors)),
+        }
+        # Validators only run inside a full check, so their share is what is left once reading and parsing are done
+        timings["validate"] = max(timings["check"] - timings["read"] - timings["parse"], 0.0)
+        clear_cache()
+        return {f"python_checker.{phase}": seconds for phase, seconds in timings.items()}
+
+    def _time_dir_checker(self, repo_dir: Path) -> dict[str, float]:
+        checker = DirChecker()
+        walker = TreeWalker(checker.should_check_dir, include_symlinks=True)
+        walked_dirs = list(walker.walk(repo_dir))
+        errors = [
+            error
+            for dir_abs_path, dir_snapshot, _ in walked_dirs
+            for error in checker.check_dir(dir_abs_path, repo_dir, dir_snapshot)
+        ]
+
+        timings = {
+            "walk": self._measure(lambda: list(walker.walk(repo_dir))),
+            "validate": self._measure(
+                lambda: [checker.check_dir(path, repo_dir, snapshot) for path, snapshot, _ in walked_dirs]
+            ),
+            "report": self._measure(lambda: self._report(errors)),
+        }
+        return {f"dir_checker.{phase}": seconds for phase, seconds in timings.items()}
+
+    def _time_just_indexer(self, repo_dir: Path) -> dict[str, float]:
+        indexer = JustIndexer()
+        return {"just_indexer.index": self._measure(lambda: indexer.run([repo_dir / "just"]))}
+
+    def _time_compose_checker(self, engine_path: Path) -> dict[str, float]:
+        # The checker runs as a subprocess, so its startup is part of the figure like in a pre-commit run
+        env = {
+            **os.environ,
+            "CONTAINER_ENGINE": str(engine_path),
+            "PYTHONPATH": os.pathsep.join(filter(None, [self._get_package_root(), os.environ.get("PYTHONPATH")])),
+        }
+        cmd = [sys.executable, "-m", "fixmate.compose_checker.cli"]
+
+        def check() -> None:
+            result = subprocess.run(cmd, capture_output=True, text=True, env=env, check=False)  # noqa: S603
+            if result.returncode:
+                msg = f"compose_checker failed on the synthetic repository: {result.stdout}{result.stderr}"
+                raise RuntimeError(msg)
+
+        return {"compose_checker.check": self._measure(check)}
+
+    def _report(self, errors: Sequence[object]) -> None:
+        with contextlib.suppress(SystemExit), Path(os.devnull).open("w") as null_stream:
+            report_errors(errors, self._null_logger, stream=null_stream)
+
+    def _measure(self, func: Callable[[], object], setup: Callable[[], object] | None = None) -> float:
+        durations = []
+
+        for _ in range(self._repeat):
+            if setup:
+                setup()
+
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+
+        return min(durations)
+
+    @staticmethod
+    def _get_package_root() -> str:
+        return str(Path(fixmate.__file__).resolve().parent.parent)
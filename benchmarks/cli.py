@@ -0,0 +1,104 @@
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from benchmarks._dto import RepoSpecsDto
+from benchmarks.baseline import Baseline
+from benchmarks.benchmark_runner import BenchmarkRunner
+from benchmarks.import_budget import ImportBudget
+from fixmate.helpers.logger import setup_logger
+
+_logger = logging.getLogger(__name__)
+
+_SIZES = {
+    "small": RepoSpecsDto(file_count=100, dir_depth=2, ignore_rule_count=10, compose_group_count=3),
+    "medium": RepoSpecsDto(file_count=1000, dir_depth=3, ignore_rule_count=50, compose_group_count=10),
+    "large": RepoSpecsDto(file_count=5000, dir_depth=4, ignore_rule_count=200, compose_group_count=30),
+}
+
+
+def main() -> None:
+    setup_logger()
+    # The commands under test log their own progress, which would bury the figures
+    logging.getLogger("fixmate").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="Benchmark every fixmate command against synthetic repositories")
+    parser.add_argument("--sizes", nargs="+", choices=list(_SIZES), default=["small"], help="Repositories to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per phase, the fastest one is kept")
+    parser.add_argument("--output", type=Path, help="Write the timings to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Compare against the timings stored in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown counted as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the timings as the new baseline")
+    parser.add_argument(
+        "--import-budget", action="store_true", help="Only check the imports of each command against its budget"
+    )
+    parser.add_argument(
+        "--budget-scale", type=float, default=1.0, help="Stretch the import budgets, for slower machines"
+    )
+    args = parser.parse_args()
+
+    if args.import_budget:
+        _check_import_budget(ImportBudget(repeat=max(args.repeat, 10), scale=args.budget_scale))
+        return
+
+    runner = BenchmarkRunner(repeat=args.repeat)
+    results = {}
+
+    for size in args.sizes:
+        _logger.info("Benchmarking the %s repository", size)
+        results[size] = runner.run(_SIZES[size])
+
+        for phase, seconds in results[size].items():
+            _logger.info("  %-32s %10.1fms", phase, seconds * 1000)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+    if not args.baseline:
+        return
+
+    baseline = Baseline(args.baseline, threshold=args.threshold)
+
+    if args.update_baseline:
+        baseline.save(results)
+        _logger.info("Baseline updated: %s", args.baseline)
+        return
+
+    regressions = baseline.find_regressions(results)
+
+    for regression in regressions:
+        _logger.error("Regression: %s", regression)
+
+    if regressions:
+        sys.exit(1)
+
+    _logger.info("No regression against %s", args.baseline)
+
+
+def _check_import_budget(import_budget: ImportBudget) -> None:
+    profiles = import_budget.measure()
+
+    for command, profile in sorted(profiles.items()):
+        _logger.info(
+            "  %-32s %10.1fms of %.1fms", command, profile.seconds * 1000, import_budget.get_budget(command) * 1000
+        )
+
+    overruns = import_budget.find_overruns(profiles)
+    unwanted_imports = import_budget.find_unwanted_imports(profiles)
+
+    for overrun in overruns:
+        _logger.error("Over budget: %s", overrun)
+
+    for unwanted_import in unwanted_imports:
+        _logger.error("Unwanted import: %s", unwanted_import)
+
+    if overruns or unwanted_imports:
+        sys.exit(1)
+
+    _logger.info("Every command is within its import budget")
+
+
+if __name__ == "__main__":
+    main()
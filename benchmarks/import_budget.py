@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import ClassVar
+
+import fixmate
+from benchmarks._dto import ImportProfileDto
+
+
+class ImportBudget:
+    """Measure with `-X importtime` how long each command spends importing modules, and compare it to a budget.
+
+    Each command runs through the `main()` of its console script in a fresh interpreter, on a tiny repository
+    shaped like a hook call, and the imports of a bare interpreter are subtracted. The fastest of `repeat` runs
+    is kept, as a busy machine only ever adds time. Timings still vary by tens of percent between runs, so the
+    budgets are about twice the measured times, and the modules each command must not import on such a call are
+    checked too, which does not depend on the machine at all.
+    """
+
+    _budgets: ClassVar[dict[str, float]] = {  # Seconds, measured at 50-70ms, 30-65ms, 35-55ms and 45-70ms
+        "python_checker": 0.140,
+        "dir_checker": 0.120,
+        "just_indexer": 0.110,
+        "compose_checker": 0.140,
+    }
+    _unwanted_modules: ClassVar[dict[str, frozenset[str]]] = {
+        "python_checker": frozenset(
+            ("dataclasses", "importlib.metadata", "multiprocessing", "socket", "subprocess", "tempfile")
+        ),
+        "dir_checker": frozenset(("concurrent.futures", "dataclasses", "subprocess", "tempfile", "tomli")),
+        "just_indexer": frozenset(("ast", "concurrent.futures", "dataclasses", "subprocess", "tempfile", "tomli")),
+        "compose_checker": frozenset(("concurrent.futures", "dataclasses", "tomli")),
+    }
+    _command_args: ClassVar[dict[str, list[str]]] = {
+        "python_checker": ["pkg/mod.py"],
+        "dir_checker": [],
+        "just_indexer": ["just"],
+        "compose_checker": ["pkg/mod.py"],
+    }
+
+    def __init__(self, repeat: int = 10, scale: float = 1.0) -> None:
+        self._repeat = max(repeat, 1)
+        self._scale = scale  # Stretches every budget, for machines slower than the one they were set on
+
+    def measure(self) -> dict[str, ImportProfileDto]:
+        """Return the import time and the imported modules of each command."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            repo_dir = Path(temp_dir)
+            self._write_repo(repo_dir)
+            bare_profile = self._measure_code(repo_dir, "pass")
+            profiles = {}
+
+            for command, args in self._command_args.items():
+                profile = self._measure_code(repo_dir, self._get_command_code(command, args))
+                profiles[command] = ImportProfileDto(
+                    seconds=max(profile.seconds - bare_profile.seconds, 0.0),
+                    modules=profile.modules - bare_profile.modules,
+                )
+
+            return profiles
+
+    def find_unwanted_imports(self, profiles: dict[str, ImportProfileDto]) -> list[str]:
+        unwanted_imports = []
+
+        for command, profile in sorted(profiles.items()):
+            unwanted_modules = profile.modules & self._unwanted_modules[command]
+            if unwanted_modules:
+                unwanted_imports.append(f"{command}: imports {', '.join(sorted(unwanted_modules))}")
+
+        return unwanted_imports
+
+    def find_overruns(self, profiles: dict[str, ImportProfileDto]) -> list[str]:
+        overruns = []
+
+        for command, profile in sorted(profiles.items()):
+            budget = self.get_budget(command)
+            if profile.seconds > budget:
+                overruns.append(
+                    f"{command}: {profile.seconds * 1000:.1f}ms of imports, over its {budget * 1000:.1f}ms budget"
+                )
+
+        return overruns
+
+    def get_budget(self, command: str) -> float:
+        return self._budgets[command] * self._scale
+
+    def _measure_code(self, repo_dir: Path, code: str) -> ImportProfileDto:
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(filter(None, [self._get_package_root(), os.environ.get("PYTHONPATH")])),
+        }
+        durations = []
+        modules: frozenset[str] = frozenset()
+
+        for _ in range(self._repeat):
+            result = subprocess.run(  # noqa: S603
+                [sys.executable, "-X", "importtime", "-c", code],
+                cwd=repo_dir,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            if result.returncode:
+                msg = f"'{code}' failed on the budget repository: {result.stdout}{result.stderr}"
+                raise RuntimeError(msg)
+
+            profile = self._parse_import_time(result.stderr)
+            durations.append(profile.seconds)
+            modules = profile.modules
+
+        return ImportProfileDto(seconds=min(durations), modules=modules)
+
+    @staticmethod
+    def _parse_import_time(importtime_output: str) -> ImportProfileDto:
+        """Sum the cumulative time of the top-level imports, the nested ones are already part of it."""
+        total_us = 0
+        modules = set()
+
+        for line in importtime_output.splitlines():
+            if not line.startswith("import time:"):
+                continue
+
+            fields = line.split("|")
+            if len(fields) != 3 or not fields[1].strip().isdigit():  # noqa: PLR2004
+                continue
+
+            modules.add(fields[2].strip())
+            # Nested imports are indented further than the single space after the separator
+            if not fields[2].startswith("  "):
+                total_us += int(fields[1])
+
+        return ImportProfileDto(seconds=total_us / 1_000_000, modules=frozenset(modules))
+
+    @staticmethod
+    def _get_command_code(command: str, args: list[str]) -> str:
+        return f"import sys; sys.argv = [{command!r}, *{args!r}]; from fixmate.{command}.cli import main; main()"
+
+    @staticmethod
+    def _write_repo(repo_dir: Path) -> None:
+        # Every command must pass on it, so a failure exit always means the command broke
+        (repo_dir / "__init__.py").write_text("")
+        (repo_dir / "pkg").mkdir()
+        (repo_dir / "pkg" / "__init__.py").write_text("")
+        (repo_dir / "pkg" / "mod.py").write_text('"""A module."""\n\nVALUE = 1\n')
+        (repo_dir / "just").mkdir()
+        (repo_dir / "just" / "__init__.py").write_text("")
+        (repo_dir / "just" / "build.just").write_text("build:\n    echo build\n")
+        (repo_dir / "pyproject.toml").write_text('[project]\nname = "budget"\n\n[tool.python_checker]\n')
+
+    @staticmethod
+    def _get_package_root() -> str:
+        return str(Path(fixmate.__file__).resolve().parent.parent)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+import stat
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from benchmarks._dto import RepoSpecsDto
+
+
+class SyntheticRepo:
+    """Generate a reproducible repository exercising every fixmate command."""
+
+    _files_per_dir = 10
+    _statements_per_func = 8
+    _validators = ("import_validator", "msg_validator", "func_validator")
+
+    def __init__(self, specs: RepoSpecsDto) -> None:
+        self._specs = specs
+        self._random = random.Random(specs.seed)  # noqa: S311
+
+    def generate(self, repo_dir: Path) -> None:
+        dir_rel_paths = self._get_package_dirs()
+        self._write_python_files(repo_dir, dir_rel_paths)
+        self._write_pyproject(repo_dir, dir_rel_paths)
+        self._write_just_files(repo_dir)
+        self._write_compose_files(repo_dir)
+        self._write_unreadable_dir(repo_dir)
+
+    def write_compose_stub(self, stub_path: Path) -> None:
+        """Write a stand-in container engine that accepts `help compose` and `compose ... config --quiet`."""
+        stub_path.parent.mkdir(parents=True, exist_ok=True)
+        delay = f"sleep {self._specs.compose_delay}\n" if self._specs.compose_delay else ""
+        stub_path.write_text(f"#!/bin/sh\n{delay}exit 0\n")
+        stub_path.chmod(stub_path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+    def _get_package_dirs(self) -> list[str]:
+        dir_count = max(self._specs.file_count // self._files_per_dir, 1)
+        depth = max(self._specs.dir_depth, 1)
+        branching = max(math.ceil(dir_count ** (1 / depth)), 2)
+        dir_rel_paths = []
+
+        for index in range(dir_count):
+            parts = []
+            remaining = index
+            for _ in range(depth):
+                remaining, digit = divmod(remaining, branching)
+                parts.append(f"pkg_{digit}")
+            dir_rel_paths.append("/".join(reversed(parts)))
+
+        return dir_rel_paths
+
+    def _write_python_files(self, repo_dir: Path, dir_rel_paths: list[str]) -> None:
+        for dir_rel_path in dir_rel_paths:
+            dir_abs_path = repo_dir / dir_rel_path
+            dir_abs_path.mkdir(parents=True, exist_ok=True)
+
+            # A few packages miss their __init__.py, so dir_checker has something to report
+            if self._random.random() < 0.9:  # noqa: PLR2004
+                (dir_abs_path / "__init__.py").write_text("")
+
+        for index in range(self._specs.file_count):
+            dir_rel_path = dir_rel_paths[index % len(dir_rel_paths)]
+            is_private = self._random.random() < 0.2  # noqa: PLR2004
+            file_name = f"_internal_{index}.py" if is_private else f"mod_{index}.py"
+            content = self._generate_module(dir_rel_paths)
+            (repo_dir / dir_rel_path / file_name).write_text(content)
+
+        # Empty directories for the empty_validator
+        for index in range(max(len(dir_rel_paths) // 20, 1)):
+            (repo_dir / f"empty_{index}").mkdir(exist_ok=True)
+
+    @staticmethod
+    def _write_unreadable_dir(repo_dir: Path) -> None:
+        """Lock a package away, the walks must skip it like `os.walk` does rather than fail (unless run as root)."""
+        locked_dir = repo_dir / "locked"
+        locked_dir.mkdir()
+        (locked_dir / "__init__.py").write_text("")
+        (locked_dir / "mod.py").write_text("import logging\n")
+        locked_dir.chmod(0)
+
+    def _generate_module(self, dir_rel_paths: list[str]) -> str:
+        lines = ["import logging", ""]
+
+        if self._random.random() < self._specs.private_import_density:
+            other_package = self._random.choice(dir_rel_paths).replace("/", ".")
+            lines.insert(1, f"from {other_package}._internal_0 import helper")
+
+        lines.extend(["_logger = logging.getLogger(__name__)", ""])
+        func_index = 0
+
+        while len(lines) < self._specs.file_lines:
+            func_index += 1
+            # Top-level public functions trip the func_validator, methods and private functions do not
+            if self._random.random() < 0.5:  # noqa: PLR2004
+                lines.extend([f"class Service{func_index}:", f"    def run_{func_index}(self, value):"])
+                indent = " " * 8
+            else:
+                name = f"helper_{func_index}" if self._random.random() < 0.3 else f"_helper_{func_index}"  # noqa: PLR2004
+                lines.append(f"def {name}(value):")
+                indent = " " * 4
+
+            lines.extend(indent + statement for statement in self._generate_statements())
+            lines.extend([f"{indent}return value", ""])
+
+        return "\n".join(lines) + "\n"
+
+    def _generate_statements(self) -> list[str]:
+        statements = []
+
+        for index in range(self._statements_per_func):
+            if self._random.random() >= self._specs.msg_density:
+                statements.append(f"value = value + {index}")
+            elif self._random.random() < 0.5:  # noqa: PLR2004
+                message = self._random.choice(["Processing %s", "processing %s", "Done with %s"])
+                statements.extend([f'msg_{index} = "{message}"', f"_logger.info(msg_{index}, value)"])
+            else:
+                message = self._random.choice(["invalid value", "Invalid value.", "value is missing"])
+                statements.extend(["if value is None:", f'    raise ValueError("{message}")'])
+
+        return statements
+
+    def _write_pyproject(self, repo_dir: Path, dir_rel_paths: list[str]) -> None:
+        file_rules: dict[str, set[str]] = {}
+        dir_rules: dict[str, set[str]] = {}
+
+        for index in range(self._specs.ignore_rule_count):
+            dir_rel_path = self._random.choice(dir_rel_paths)
+            validator = self._random.choice(self._validators)
+            # Alternate glob patterns with plain prefixes, both kinds of rules take a different path when matching
+            pattern = f"{dir_rel_path}/mod_{index}*.py" if index % 2 else dir_rel_path.rsplit("/", 1)[0]
+            file_rules.setdefault(pattern, set()).add(validator)
+            dir_rules.setdefault(dir_rel_path, set()).add("empty_validator")
+
+        content = [
+            "[tool.python_checker.per-file-ignores]",
+            *self._format_rules(file_rules),
+            "",
+            "[tool.dir_checker.per-dir-ignores]",
+            *self._format_rules(dir_rules),
+            "",
+            "[tool.just_indexer]",
+            'include-patterns = ["[!_]*.just"]',
+        ]
+        (repo_dir / "pyproject.toml").write_text("\n".join(content) + "\n")
+
+    @staticmethod
+    def _format_rules(rules: dict[str, set[str]]) -> list[str]:
+        # A JSON list of strings is also a valid TOML array
+        return [f'"{pattern}" = {json.dumps(sorted(validators))}' for pattern, validators in rules.items()]
+
+    def _write_just_files(self, repo_dir: Path) -> None:
+        just_dir = repo_dir / "just"
+        just_dir.mkdir(exist_ok=True)
+
+        for index in range(self._specs.just_file_count):
+            prefix = "_" if index % 5 == 0 else ""
+            (just_dir / f"{prefix}recipes_{index}.just").write_text(f"recipe_{index}:\n    echo {index}\n")
+
+    def _write_compose_files(self, repo_dir: Path) -> None:
+        for index in range(self._specs.compose_group_count):
+            service_dir = repo_dir / "services" / f"svc_{index}"
+            service_dir.mkdir(parents=True, exist_ok=True)
+            (service_dir / "docker-compose.yml").write_text(f"services:\n  svc_{index}:\n    image: busybox\n")
+            (service_dir / "docker-compose.dev.yml").write_text(f"services:\n  svc_{index}:\n    command: 'true'\n")
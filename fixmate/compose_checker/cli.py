@@ -1,27 +1,27 @@
-import logging
-import subprocess
-import sys
+import argparse
 from pathlib import Path
 
+from fixmate.compose_checker.compose_checker import ComposeChecker
 from fixmate.helpers.logger import setup_logger
-
-_logger = logging.getLogger(__name__)
+from fixmate.helpers.reporter import parse_max_errors
 
 
 def main() -> None:
     setup_logger()
 
-    script_path = Path(__file__).parent / "compose_checker.sh"
-    cmd = [str(script_path), *sys.argv[1:]]
-
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)  # noqa: S603
-    except subprocess.CalledProcessError as e:
-        _logger.exception(e.stderr)
-        sys.exit(1)
-    else:
-        _logger.info(result.stdout)
-        sys.exit(result.returncode)
+    parser = argparse.ArgumentParser(description="Docker compose files checker")
+    parser.add_argument("--env-file", type=Path, help="Env file passed to every compose call")
+    parser.add_argument("--jobs", type=int, help="Number of groups validated concurrently (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the result cache")
+    parser.add_argument("--max-errors", type=parse_max_errors, metavar="N", help="Stop once N errors were reported")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop at the first error (same as --max-errors 1)")
+    parser.add_argument("files", nargs="*", help="Compose files whose groups to check (default: discover all)")
+    args = parser.parse_args()
+    max_errors = 1 if args.fail_fast else args.max_errors
+
+    ComposeChecker(env_file=args.env_file, jobs=args.jobs, use_cache=not args.no_cache).run(
+        files_to_check=args.files, max_errors=max_errors
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+from contextlib import closing, suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, NoReturn
+
+from fixmate.helpers.dir_tools import DirSnapshotDto, is_blacklisted_dir, is_hidden_dir, scan_dir
+from fixmate.helpers.reporter import report_errors
+from fixmate.helpers.result_cache import ResultCache
+from fixmate.helpers.tree_walker import TreeWalker
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterator
+    from concurrent.futures import Future
+
+
+class ComposeChecker:
+    """Validate compose files with `compose config`, one call per group of a base file and its overrides."""
+
+    error_code = "compose_checker"
+    _file_pattern = re.compile(r"(docker-)?compose.*\.ya?ml")
+    _base_suffixes = (
+        ".base",
+        "-base",
+        ".dev",
+        "-dev",
+        ".development",
+        "-development",
+        ".local",
+        "-local",
+        ".stage",
+        "-stage",
+        ".staging",
+        "-staging",
+        ".prod",
+        "-prod",
+        ".production",
+        "-production",
+    )
+    _ignored_output = "variable is not set. Defaulting"
+    _variable_pattern = re.compile(rb"\$\{?([A-Za-z_][A-Za-z0-9_]*)")
+    _engine_env_prefixes = ("COMPOSE_", "DOCKER_", "PODMAN_", "CONTAINER_")
+    # Keys naming other files the engine reads, which the cache key would have to cover as well
+    _file_reference_pattern = re.compile(rb"^[ \t-]*(env_file|extends|include|label_file)[ \t]*:", re.MULTILINE)
+    _compose_plugin_dirs = (
+        "~/.docker/cli-plugins",
+        "/usr/local/lib/docker/cli-plugins",
+        "/usr/local/libexec/docker/cli-plugins",
+        "/usr/lib/docker/cli-plugins",
+        "/usr/libexec/docker/cli-plugins",
+    )
+    _cache_max_age = 30 * 24 * 60 * 60
+
+    def __init__(self, env_file: Path | None = None, *, jobs: int | None = None, use_cache: bool = True) -> None:
+        self._env_file = env_file
+        self._jobs = max(jobs or os.cpu_count() or 1, 1)
+        self._walker = TreeWalker(self.should_check_dir)
+        self._cache = ResultCache(Path.cwd(), "compose_checker", max_age=self._cache_max_age) if use_cache else None
+        self._logger = logging.getLogger(__name__)
+
+    def run(self, files_to_check: list[str] | None = None, max_errors: int | None = None) -> NoReturn:
+        # Closing the stream once the error budget is spent drops the groups not started yet
+        with closing(self.iter_errors(files_to_check)) as errors:
+            report_errors(errors, self._logger, max_errors)
+
+    def iter_errors(self, files_to_check: list[str] | None = None) -> Generator[str, None, None]:
+        """Yield an error per invalid group, in the order the engine finishes with them.
+
+        With `files_to_check`, only the groups these files belong to are validated, each with all its files.
+        """
+        file_groups = self._get_file_groups(Path.cwd(), files_to_check)
+
+        # The engine is only looked up once there is something to validate
+        if file_groups:
+            yield from self._validate_groups(self._get_compose_cmd(), file_groups)
+
+    def should_check_dir(self, dir_name: str) -> bool:
+        return not is_hidden_dir(dir_name) and not is_blacklisted_dir(dir_name)
+
+    def _get_file_groups(self, exec_abs_path: Path, files_to_check: list[str] | None) -> list[list[str]]:
+        if files_to_check:
+            return self._group_files(self._get_group_files(exec_abs_path, files_to_check))
+
+        file_groups = self._group_files(self._discover_files(exec_abs_path))
+
+        if not file_groups:
+            self._logger.error("No compose files found")
+            raise SystemExit(1)
+
+        return file_groups
+
+    def _validate_groups(self, compose_cmd: list[str], file_groups: list[list[str]]) -> Iterator[str]:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        cache_keys = self._make_cache_keys(compose_cmd, file_groups)
+        futures: dict[Future[tuple[int, str]], tuple[list[str], str]] = {}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self._jobs) as executor:
+                cached_results = []
+
+                for group, cache_key in zip(file_groups, cache_keys):
+                    cached_result = self._cache.get(cache_key) if self._cache and cache_key else None
+
+                    # Only the groups whose inputs changed since their last validation reach the engine
+                    if cached_result is not None and len(cached_result) == 2:  # noqa: PLR2004
+                        cached_results.append((group, int(cached_result[0]), cached_result[1]))
+                    else:
+                        futures[executor.submit(self._check_group, compose_cmd, group)] = (group, cache_key)
+
+                for group, return_code, output in cached_results:
+                    yield from self._report_group(group, return_code, output)
+
+                try:
+                    for future in as_completed(futures):
+                        group, cache_key = futures[future]
+                        return_code, output = future.result()
+
+                        if self._cache and cache_key:
+                            self._cache.set(cache_key, [str(return_code), output])
+
+                        yield from self._report_group(group, return_code, output)
+                finally:
+                    for future in futures:
+                        future.cancel()
+        finally:
+            if self._cache:
+                self._cache.evict()
+
+    def _report_group(self, group: list[str], return_code: int, output: str) -> Iterator[str]:
+        group_str = ", ".join(group)
+
+        if return_code:
+            yield f"{group_str}: failed validation [{self.error_code}]" + (f"\n{output}" if output else "")
+        elif output:
+            self._logger.warning("%s:\n%s", group_str, output)
+
+    def _make_cache_keys(self, compose_cmd: list[str], file_groups: list[list[str]]) -> list[str]:
+        """Return the cache key of each group, empty for the groups that are never cached."""
+        if not self._cache:
+            return [""] * len(file_groups)
+
+        engine_stamp = self._get_engine_stamp(compose_cmd)
+        env_file_content = self._read_bytes(self._env_file) if self._env_file else b""
+        engine_env = [f"{k}={v}" for k, v in sorted(os.environ.items()) if k.startswith(self._engine_env_prefixes)]
+        cache_keys = []
+
+        for group in file_groups:
+            contents = [self._read_bytes(Path(file)) for file in group]
+
+            # Telling which files these keys point to takes parsing the YAML, so such groups always reach the engine
+            if any(self._file_reference_pattern.search(content) for content in contents):
+                cache_keys.append("")
+                continue
+
+            # Compose reads the .env file of the project directory, which is the one of the first file
+            dot_env_content = self._read_bytes(Path(group[0]).parent / ".env")
+            interpolated_env = self._get_interpolated_env([*contents, env_file_content, dot_env_content])
+            cache_keys.append(
+                self._cache.make_key(
+                    engine_stamp,
+                    *engine_env,
+                    *interpolated_env,
+                    env_file_content,
+                    dot_env_content,
+                    *(part for file, content in zip(group, contents) for part in (file, content)),
+                )
+            )
+
+        return cache_keys
+
+    def _get_interpolated_env(self, contents: list[bytes]) -> list[str]:
+        """Return the environment variables the files may interpolate, set or not, as cache key parts."""
+        names = {name.decode() for content in contents for name in self._variable_pattern.findall(content)}
+        return [f"{name}={os.environ[name]}" if name in os.environ else name for name in sorted(names)]
+
+    def _get_engine_stamp(self, compose_cmd: list[str]) -> str:
+        """Return what identifies the installed compose version, the path, mtime and size of its binaries.
+
+        Asking the engine for its version would cost as much as a whole run on a warm cache. With `docker compose`
+        or `podman compose`, the compose part is a plugin or an external provider, which is stamped as well.
+        """
+        binary_paths = [shutil.which(compose_cmd[0])]
+
+        if len(compose_cmd) > 1:
+            binary_paths.extend(shutil.which(name) for name in ("docker-compose", "podman-compose"))
+            binary_paths.extend(
+                str(Path(plugin_dir).expanduser() / "docker-compose") for plugin_dir in self._compose_plugin_dirs
+            )
+
+        stamp_parts = [" ".join(compose_cmd)]
+
+        for binary_path in binary_paths:
+            if binary_path:
+                with suppress(OSError):
+                    stat = Path(binary_path).stat()
+                    stamp_parts.append(f"{binary_path}:{stat.st_mtime_ns}:{stat.st_size}")
+
+        return "\0".join(stamp_parts)
+
+    def _get_compose_cmd(self) -> list[str]:
+        engine = self._get_engine()
+
+        if shutil.which(engine) and self._succeeds([engine, "help", "compose"]):
+            return [engine, "compose"]
+
+        if shutil.which(f"{engine}-compose"):
+            return [f"{engine}-compose"]
+
+        self._logger.error("Neither '%s-compose' or '%s compose' were found", engine, engine)
+        raise SystemExit(1)
+
+    def _get_engine(self) -> str:
+        engine = os.environ.get("CONTAINER_ENGINE")
+        if engine:
+            return engine
+
+        for engine in ("docker", "podman"):
+            if shutil.which(engine):
+                return engine
+
+        self._logger.error("Neither 'docker' or 'podman' were found")
+        raise SystemExit(1)
+
+    def _discover_files(self, exec_abs_path: Path) -> list[str]:
+        return [
+            str((dir_abs_path / file_name).relative_to(exec_abs_path))
+            for dir_abs_path, dir_snapshot, _ in self._walker.walk(exec_abs_path)
+            for file_name in sorted(dir_snapshot.file_names - dir_snapshot.symlink_names)
+            if self._file_pattern.fullmatch(file_name)
+        ]
+
+    def _get_group_files(self, exec_abs_path: Path, files_to_check: list[str]) -> list[str]:
+        """Return the given compose files along with the base and override files they are validated with."""
+        group_files: set[str] = set()
+        dir_snapshots: dict[Path, DirSnapshotDto | None] = {}
+
+        for file in files_to_check:
+            file_rel_path = Path(file)
+            if not self._file_pattern.fullmatch(file_rel_path.name):
+                continue
+
+            dir_rel_path = file_rel_path.parent
+            if dir_rel_path not in dir_snapshots:
+                dir_snapshots[dir_rel_path] = self._scan_dir(exec_abs_path / dir_rel_path)
+
+            dir_snapshot = dir_snapshots[dir_rel_path]
+            if dir_snapshot is None:
+                continue
+
+            base_name = self._get_base_name(str(file_rel_path))
+            group_files.update(
+                str(dir_rel_path / file_name)
+                for file_name in dir_snapshot.file_names - dir_snapshot.symlink_names
+                if self._file_pattern.fullmatch(file_name)
+                and self._get_base_name(str(dir_rel_path / file_name)) == base_name
+            )
+
+        return sorted(group_files)
+
+    def _group_files(self, files: list[str]) -> list[list[str]]:
+        file_groups: dict[str, list[str]] = {}
+
+        for file in files:
+            file_groups.setdefault(self._get_base_name(file), []).append(file)
+
+        return [self._sort_group(base_name, group) for base_name, group in sorted(file_groups.items())]
+
+    def _sort_group(self, base_name: str, group: list[str]) -> list[str]:
+        # The base file goes first so the overrides apply on top of it, the way compose expects them
+        return sorted(group, key=lambda file: (self._strip_ext(file) != base_name, file))
+
+    def _get_base_name(self, file: str) -> str:
+        name_without_ext = self._strip_ext(file)
+
+        for suffix in self._base_suffixes:
+            if name_without_ext.endswith(suffix):
+                return name_without_ext[: -len(suffix)]
+
+        return name_without_ext
+
+    def _check_group(self, compose_cmd: list[str], group: list[str]) -> tuple[int, str]:
+        cmd = [*compose_cmd]
+
+        for file in group:
+            cmd.extend(["--file", file])
+
+        if self._env_file:
+            cmd.extend(["--env-file", str(self._env_file)])
+
+        cmd.extend(["config", "--quiet"])
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False)  # noqa: S603
+        output_lines = [line for line in result.stdout.splitlines() if self._ignored_output not in line]
+        return result.returncode, "\n".join(output_lines)
+
+    @staticmethod
+    def _scan_dir(dir_abs_path: Path) -> DirSnapshotDto | None:
+        try:
+            return scan_dir(dir_abs_path)
+        except OSError:
+            return None
+
+    @staticmethod
+    def _read_bytes(file_path: Path) -> bytes:
+        try:
+            return file_path.read_bytes()
+        except OSError:
+            return b""
+
+    @staticmethod
+    def _strip_ext(file: str) -> str:
+        return file.rsplit(".", 1)[0]
+
+    @staticmethod
+    def _succeeds(cmd: list[str]) -> bool:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)  # noqa: S603
+        return result.returncode == 0
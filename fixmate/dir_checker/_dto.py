@@ -1,10 +1,17 @@
-from dataclasses import dataclass
 from pathlib import Path
+from typing import NamedTuple
 
+from fixmate.helpers.dir_tools import DirSnapshotDto
 
-@dataclass
-class DirSpecsDto:
+
+class DirSpecsDto(NamedTuple):
     exec_abs_path: Path
     abs_path: Path
+    rel_path: Path
+    snapshot: DirSnapshotDto
+    errors: list[str]
+
+
+class DirResultDto(NamedTuple):
     rel_path: Path
     errors: list[str]
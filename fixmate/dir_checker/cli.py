@@ -1,8 +1,13 @@
 import argparse
+import logging
+from contextlib import closing
 from pathlib import Path
 
 from fixmate.dir_checker.dir_checker import DirChecker
 from fixmate.helpers.logger import setup_logger
+from fixmate.helpers.reporter import parse_max_errors, report_errors
+
+_logger = logging.getLogger(__name__)
 
 
 def main() -> None:
@@ -10,10 +15,45 @@ def main() -> None:
 
     parser = argparse.ArgumentParser(description="Directory structure checker")
     parser.add_argument("--config", type=Path, help="Path to pyproject.toml file")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the cached configuration")
+    parser.add_argument("--walk-threads", type=int, default=1, help="Threads listing directories concurrently")
+    parser.add_argument("--changed-since", metavar="REF", help="Only check directories changed since this git ref")
+    parser.add_argument("--watch", action="store_true", help="Re-check changed paths until interrupted")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between two polls in watch mode")
+    parser.add_argument("--max-errors", type=parse_max_errors, metavar="N", help="Stop once N errors were reported")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop at the first error (same as --max-errors 1)")
+    parser.add_argument("--stats", action="store_true", help="Print timings per phase and validator")
+    parser.add_argument(
+        "--stats-format", choices=["table", "json"], default="table", help="Print the timings as a table or as JSON"
+    )
     parser.add_argument("dirs", nargs="*", help="Directories to check (optional)")
     args = parser.parse_args()
+    max_errors = 1 if args.fail_fast else args.max_errors
+
+    if args.watch:
+        DirChecker(config_path=args.config, use_cache=not args.no_cache, walk_threads=args.walk_threads).watch(
+            interval=args.interval
+        )
+        return
+
+    stats = None
+
+    if args.stats:
+        from fixmate.helpers.stats_recorder import StatsRecorder
+
+        stats = StatsRecorder()
+
+    checker = DirChecker(
+        config_path=args.config, use_cache=not args.no_cache, walk_threads=args.walk_threads, stats=stats
+    )
 
-    DirChecker(config_path=args.config).run(dirs_to_check=args.dirs)
+    try:
+        # Closing the stream once the error budget is spent stops the walk where it is
+        with closing(checker.iter_errors(args.dirs, args.changed_since)) as errors:
+            report_errors(errors, _logger, max_errors)
+    finally:
+        if stats:
+            stats.log_summary(_logger, args.stats_format)
 
 
 if __name__ == "__main__":
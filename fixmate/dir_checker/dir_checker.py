@@ -1,66 +1,201 @@
 from __future__ import annotations
 
-import fnmatch
 import logging
-import os
+import time
+from contextlib import AbstractContextManager, closing, nullcontext
 from pathlib import Path
-from typing import NoReturn
+from typing import TYPE_CHECKING
 
-from fixmate.dir_checker._dto import DirSpecsDto
+from fixmate.dir_checker._dto import DirResultDto, DirSpecsDto
 from fixmate.dir_checker._empty_validator import EmptyValidator
 from fixmate.dir_checker._init_py_validator import InitPyValidator
 from fixmate.helpers.config_loader import load_configs
-from fixmate.helpers.dir_tools import is_blacklisted_dir, is_hidden_dir
+from fixmate.helpers.dir_tools import DirSnapshotDto, is_blacklisted_dir, is_hidden_dir, scan_dir
+from fixmate.helpers.git_tools import get_changed_paths
+from fixmate.helpers.ignore_matcher import IgnoreMatcher
+from fixmate.helpers.reporter import log_errors
+from fixmate.helpers.tree_walker import TreeWalker
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable, Iterator
+
+    from fixmate.helpers.stats_recorder import StatsRecorder
 
 
 class DirChecker:
-    def __init__(self, config_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        config_path: Path | None = None,
+        *,
+        configs: dict | None = None,
+        use_cache: bool = True,
+        walk_threads: int = 1,
+        stats: StatsRecorder | None = None,
+    ) -> None:
         config_path = config_path or Path("pyproject.toml")
-        self._configs = load_configs(config_path, "dir_checker")
-        self._ignore_rules = self._load_ignore_rules()
+        self._configs = (
+            configs if configs is not None else load_configs(config_path, "dir_checker", use_cache=use_cache)
+        )
+        self._walker = TreeWalker(self.should_check_dir, threads=walk_threads, include_symlinks=True)
+        self._ignore_matcher = IgnoreMatcher(self._load_ignore_rules())
         self._empty_validator = EmptyValidator()
         self._init_py_validator = InitPyValidator()
+        self._stats = stats
         self._logger = logging.getLogger(__name__)
 
-    def run(self, dirs_to_check: list[str] | None = None) -> NoReturn:
+    def iter_errors(
+        self, dirs_to_check: list[str] | None = None, changed_since: str | None = None
+    ) -> Generator[str, None, None]:
+        """Yield errors as soon as the directory they belong to is validated, while the walk is still going on."""
         dirs_to_check = dirs_to_check or []
         exec_abs_path = Path.cwd()
-        errors = self._validate_dirs(exec_abs_path, dirs_to_check)
-
-        if errors:
-            for error in errors:
-                self._logger.error(error)
-            raise SystemExit(1)
-
-        self._logger.info("All checks passed")
-        raise SystemExit(0)
+        changed_dirs = None
+
+        if changed_since and not dirs_to_check:
+            with self._measure("git"):
+                changed_dirs = self._get_changed_dirs(exec_abs_path, changed_since)
+
+        if changed_dirs is not None:
+            results = self.check_dirs(changed_dirs, root=exec_abs_path, recursive=False)
+        else:
+            results = self.check_dirs(dirs_to_check or None, root=exec_abs_path)
+
+        with closing(results):
+            for result in results:
+                yield from result.errors
+
+    def check_dirs(
+        self, dirs: Iterable[Path | str] | None = None, *, root: Path | None = None, recursive: bool = True
+    ) -> Generator[DirResultDto, None, None]:
+        """Validate directories and yield a result per directory, as the walk reaches it.
+
+        Relative paths are taken from `root`, the current directory by default, which is checked as a whole
+        when `dirs` is None. With `recursive`, the sub-directories of each directory are validated too. Nothing
+        is logged and nothing exits, so the same checker can serve any number of calls in one process.
+        """
+        root_abs_path = Path.cwd() / root if root else Path.cwd()
+        dir_abs_paths = [root_abs_path / d for d in dirs] if dirs is not None else [root_abs_path]
+
+        for dir_abs_path in dir_abs_paths:
+            for walked_abs_path, dir_snapshot in self._walk_dir(dir_abs_path, recursive=recursive):
+                yield DirResultDto(
+                    rel_path=walked_abs_path.relative_to(root_abs_path),
+                    errors=self.check_dir(walked_abs_path, root_abs_path, dir_snapshot),
+                )
+
+    def watch(self, interval: float = 1.0) -> None:
+        """Check the whole tree, then re-validate the directories that change and print the current errors."""
+        exec_abs_path = Path.cwd()
+        from fixmate.helpers.poll_watcher import PollWatcher
+
+        watcher = PollWatcher(self.should_check_dir, interval=interval)
+        dir_errors = {
+            dir_abs_path: self.check_dir(dir_abs_path, exec_abs_path, dir_snapshot)
+            for dir_abs_path, dir_snapshot, _ in self._walker.walk(exec_abs_path)
+        }
+        self._log_watched_errors(dir_errors)
+
+        try:
+            for changed_paths in watcher.watch([exec_abs_path]):
+                removed_paths = {path for path in changed_paths if not path.exists()}
+                # Adding or removing an entry changes its parent's content, which is what the validators look at
+                changed_dirs = {path.parent for path in changed_paths} | {
+                    path for path in changed_paths if path in dir_errors or path.is_dir()
+                }
+
+                # A removed directory takes the errors of everything below it along
+                for dir_abs_path in list(dir_errors):
+                    if dir_abs_path in removed_paths or not removed_paths.isdisjoint(dir_abs_path.parents):
+                        del dir_errors[dir_abs_path]
+
+                for dir_abs_path in sorted(changed_dirs):
+                    dir_errors.pop(dir_abs_path, None)
+                    if dir_abs_path == exec_abs_path or exec_abs_path in dir_abs_path.parents:
+                        self._check_watched_dir(dir_abs_path, exec_abs_path, dir_errors)
+
+                self._log_watched_errors(dir_errors)
+        except KeyboardInterrupt:
+            self._logger.info("Stopped watching")
+
+    def check_dir(self, dir_abs_path: Path, exec_abs_path: Path, dir_snapshot: DirSnapshotDto) -> list[str]:
+        dir_rel_path = dir_abs_path.relative_to(exec_abs_path)
+        return self._validate_dir(dir_abs_path, dir_rel_path, exec_abs_path, dir_snapshot)
+
+    def should_check_dir(self, dir_name: str) -> bool:
+        return not is_hidden_dir(dir_name) and not is_blacklisted_dir(dir_name)
 
-    def _validate_dirs(self, exec_abs_path: Path, dirs_to_check: list[str]) -> list[str]:
-        errors: list[str] = []
-        check_abs_paths = [exec_abs_path / d for d in dirs_to_check] if dirs_to_check else [exec_abs_path]
+    def _check_watched_dir(self, dir_abs_path: Path, exec_abs_path: Path, dir_errors: dict[Path, list[str]]) -> None:
+        try:
+            dir_snapshot = scan_dir(dir_abs_path)
+        except OSError:
+            return  # Removed or unreadable, like the walk does, there is nothing to validate
 
-        for check_abs_path in check_abs_paths:
-            # Check the directory itself
-            check_rel_path = check_abs_path.relative_to(exec_abs_path)
-            errors.extend(self._validate_dir(check_abs_path, check_rel_path, exec_abs_path))
+        dir_errors[dir_abs_path] = self.check_dir(dir_abs_path, exec_abs_path, dir_snapshot)
 
-            # Check all subdirectories
-            for root_path, dir_names, _ in os.walk(check_abs_path):
-                dir_names[:] = [d for d in dir_names if self._should_check(d)]
+    def _log_watched_errors(self, dir_errors: dict[Path, list[str]]) -> None:
+        errors = (error for dir_abs_path in sorted(dir_errors) for error in dir_errors[dir_abs_path])
 
-                for dir_name in dir_names:
-                    dir_abs_path = Path(root_path) / dir_name
-                    dir_rel_path = dir_abs_path.relative_to(exec_abs_path)
-                    errors.extend(self._validate_dir(dir_abs_path, dir_rel_path, exec_abs_path))
+        if log_errors(errors, self._logger):
+            self._logger.info("Watching for changes, press Ctrl+C to stop")
+        else:
+            self._logger.info("All checks passed, watching for changes, press Ctrl+C to stop")
 
-        return errors
+    def _walk_dir(self, dir_abs_path: Path, *, recursive: bool) -> Iterator[tuple[Path, DirSnapshotDto]]:
+        if not recursive:
+            with self._measure("walk"):
+                try:
+                    dir_snapshot = scan_dir(dir_abs_path)
+                except OSError:
+                    return  # Skipped like an unreadable directory of a walk
 
-    def _should_check(self, dir_name: str) -> bool:
-        return not is_hidden_dir(dir_name) and not is_blacklisted_dir(dir_name)
+            yield dir_abs_path, dir_snapshot
+            return
 
-    def _validate_dir(self, dir_abs_path: Path, dir_rel_path: Path, exec_abs_path: Path) -> list[str]:
-        dir_specs = DirSpecsDto(exec_abs_path=exec_abs_path, abs_path=dir_abs_path, rel_path=dir_rel_path, errors=[])
+        walked_dirs = self._walker.walk(dir_abs_path)
+        if self._stats:
+            walked_dirs = self._stats.time_iter("walk", walked_dirs)
+
+        for walked_abs_path, dir_snapshot, _ in walked_dirs:
+            yield walked_abs_path, dir_snapshot
+
+    def _get_changed_dirs(self, exec_abs_path: Path, changed_since: str) -> list[Path] | None:
+        """Return the directories whose content changed since the given git ref."""
+        changed_paths = get_changed_paths(changed_since)
+
+        if changed_paths is None:
+            self._logger.warning("Could not list the changes since '%s', checking all directories", changed_since)
+            return None
+
+        existing_paths, removed_paths = changed_paths
+        dir_rel_paths = {Path(path_str).parent for path_str in existing_paths}
+
+        for path_str in removed_paths:
+            # A removal can take whole directories with it, the closest one left is the one whose content changed
+            dir_rel_path = Path(path_str).parent
+            while dir_rel_path.parts and not (exec_abs_path / dir_rel_path).is_dir():
+                dir_rel_path = dir_rel_path.parent
+            dir_rel_paths.add(dir_rel_path)
+
+        return sorted(
+            dir_rel_path
+            for dir_rel_path in dir_rel_paths
+            if all(self.should_check_dir(d) for d in dir_rel_path.parts) and (exec_abs_path / dir_rel_path).is_dir()
+        )
+
+    def _validate_dir(
+        self, dir_abs_path: Path, dir_rel_path: Path, exec_abs_path: Path, dir_snapshot: DirSnapshotDto
+    ) -> list[str]:
+        dir_specs = DirSpecsDto(
+            exec_abs_path=exec_abs_path, abs_path=dir_abs_path, rel_path=dir_rel_path, snapshot=dir_snapshot, errors=[]
+        )
+
+        if not self._stats:
+            self._run_validators(dir_specs)
+            return dir_specs.errors
+
+        start = time.perf_counter()
         self._run_validators(dir_specs)
+        self._stats.record_path(str(dir_rel_path), time.perf_counter() - start)
         return dir_specs.errors
 
     def _run_validators(self, dir_specs: DirSpecsDto) -> None:
@@ -70,21 +205,22 @@ class DirChecker:
             return
 
         if self._empty_validator.error_code not in ignored_validators:
-            self._empty_validator.validate(dir_specs)
+            with self._measure_validator(self._empty_validator.error_code):
+                self._empty_validator.validate(dir_specs)
 
         if self._init_py_validator.error_code not in ignored_validators:
-            self._init_py_validator.validate(dir_specs)
+            with self._measure_validator(self._init_py_validator.error_code):
+                self._init_py_validator.validate(dir_specs)
 
-    def _get_ignored_validators(self, dir_rel_path: Path) -> list[str]:
-        """Return validators to ignore for a given directory."""
-        all_ignored_validators = []
-        dir_rel_str = str(dir_rel_path)
+    def _measure(self, phase: str) -> AbstractContextManager[None]:
+        return self._stats.phase(phase) if self._stats else nullcontext()
 
-        for ignored_path_str, ignored_validators in self._ignore_rules.items():
-            if fnmatch.fnmatch(dir_rel_str, ignored_path_str) or dir_rel_str.startswith(ignored_path_str):
-                all_ignored_validators.extend(ignored_validators)
+    def _measure_validator(self, error_code: str) -> AbstractContextManager[None]:
+        return self._stats.validator(error_code) if self._stats else nullcontext()
 
-        return all_ignored_validators
+    def _get_ignored_validators(self, dir_rel_path: Path) -> set[str]:
+        """Return validators to ignore for a given directory."""
+        return self._ignore_matcher.match(dir_rel_path)
 
     def _load_ignore_rules(self) -> dict[str, list[str]]:
         return self._configs.get("per-dir-ignores", {})
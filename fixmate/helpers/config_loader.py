@@ -1,13 +1,147 @@
+from __future__ import annotations
+
+import logging
 from pathlib import Path
+from typing import Callable
+
+_TStamp = tuple[str, int, int]  # Resolved path, mtime in nanoseconds and size of a configuration file
+
+_logger = logging.getLogger(__name__)
+_parsed_configs: dict[_TStamp, dict] = {}  # Every command of a process shares a single parse of each file
+
+
+def load_configs(config_path: Path, section: str, *, use_cache: bool = True) -> dict:
+    """Return the normalized settings of one command, its defaults when the file or the section is missing."""
+    stamp = get_config_stamp(config_path)
+
+    # Projects rarely configure every command, the others skip parsing the file and importing the parser at all
+    if stamp is not None and stamp not in _parsed_configs and section not in _read_config(config_path):
+        return _normalize_section(section, {})
+
+    return load_tool_configs(config_path, use_cache=use_cache).get(section, _normalize_section(section, {}))
+
+
+def load_tool_configs(config_path: Path, *, use_cache: bool = True) -> dict:
+    """Return the normalized settings of every fixmate command, parsing the file at most once per process.
+
+    With `use_cache`, they are also kept in the on-disk cache, so the next processes skip the TOML parsing as
+    long as the file keeps its mtime and size.
+    """
+    stamp = get_config_stamp(config_path)
+    if stamp is None:
+        return {section: normalizer({}) for section, normalizer in _normalizers.items()}
+
+    if stamp in _parsed_configs:
+        return _parsed_configs[stamp]
+
+    # Imported here as only the first parse of a file needs it
+    from fixmate.helpers.result_cache import ResultCache
+
+    cache = ResultCache(Path.cwd(), "config", max_size=1024 * 1024) if use_cache else None
+    cache_key = cache.make_key(*map(str, stamp)) if cache else ""
+    cached = cache.get(cache_key) if cache else None
+
+    if cached and isinstance(cached[0], dict):
+        tool_configs = cached[0]
+    else:
+        tool_configs = _parse_tool_configs(_read_config(config_path))
+        if cache:
+            cache.set(cache_key, [tool_configs])
+            cache.evict()
+
+    _parsed_configs[stamp] = tool_configs
+    return tool_configs
+
+
+def get_config_stamp(config_path: Path) -> _TStamp | None:
+    """Return what identifies a version of a configuration file, None when there is no such file."""
+    try:
+        stat = config_path.stat()
+    except OSError:
+        return None
+
+    return str(config_path.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+def _read_config(config_path: Path) -> str:
+    try:
+        return config_path.read_bytes().decode()
+    except OSError:
+        return ""
 
-import tomli
 
+def _parse_tool_configs(content: str) -> dict:
+    tool_table = {}
 
-def load_configs(config_path: Path, section: str) -> dict:
-    if not config_path.exists():
+    if "tool" in content:
+        # Only imported once there is something to parse, as it is a noticeable part of the startup
+        import tomli
+
+        tool_table = tomli.loads(content).get("tool", {})
+
+    return {section: normalizer(tool_table.get(section, {})) for section, normalizer in _normalizers.items()}
+
+
+def _normalize_section(section: str, configs: dict) -> dict:
+    """Keep the settings fixmate knows of, in a shape the commands can use as is."""
+    normalizer = _normalizers.get(section)
+    return normalizer(configs) if normalizer else configs
+
+
+def _normalize_python_checker(configs: dict) -> dict:
+    source_roots = configs.get("source-roots")
+
+    if not isinstance(source_roots, list) or not all(isinstance(root, str) and root for root in source_roots):
+        if source_roots is not None:
+            _logger.warning("Ignoring `source-roots`, it should be a list of directories")
+        source_roots = []
+
+    return {"per-file-ignores": _normalize_ignore_rules(configs, "per-file-ignores"), "source-roots": source_roots}
+
+
+def _normalize_dir_checker(configs: dict) -> dict:
+    return {"per-dir-ignores": _normalize_ignore_rules(configs, "per-dir-ignores")}
+
+
+def _normalize_just_indexer(configs: dict) -> dict:
+    output_file_name = configs.get("output-file-name")
+    modules_optional = configs.get("modules-optional")
+    include_patterns = configs.get("include-patterns")
+
+    if not isinstance(include_patterns, list):
+        include_patterns = []
+    include_patterns = [pattern for pattern in include_patterns if isinstance(pattern, str) and pattern]
+
+    return {
+        "output-file-name": output_file_name
+        if isinstance(output_file_name, str) and output_file_name
+        else "_index.just",
+        "modules-optional": modules_optional if isinstance(modules_optional, bool) else True,
+        "include-patterns": include_patterns or ["[!_]*.just"],
+    }
+
+
+def _normalize_ignore_rules(configs: dict, key: str) -> dict[str, list[str]]:
+    """Keep the rules mapping a pattern to a list of validator names, warning about the others."""
+    rules = configs.get(key, {})
+    if not isinstance(rules, dict):
+        _logger.warning("Ignoring `%s`, it should map patterns to lists of validators", key)
         return {}
 
-    with config_path.open("rb") as file_obj:
-        config = tomli.load(file_obj)
+    normalized_rules = {}
+
+    for pattern, validators in rules.items():
+        if not pattern or not isinstance(validators, list) or not all(isinstance(v, str) for v in validators):
+            _logger.warning("Ignoring the `%s` rule of %r, it should be a list of validators", key, pattern)
+            continue
+
+        normalized_rules[pattern] = sorted(set(validators))
+
+    return normalized_rules
+
 
-    return config.get("tool", {}).get(section, {})
+_normalizers: dict[str, Callable[[dict], dict]] = {
+    "python_checker": _normalize_python_checker,
+    "dir_checker": _normalize_dir_checker,
+    "just_indexer": _normalize_just_indexer,
+}
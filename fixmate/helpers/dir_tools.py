@@ -1,3 +1,25 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class DirSnapshotDto(NamedTuple):
+    """Entries of a directory at the time it was listed.
+
+    Like the other DTOs of the commands, a named tuple rather than a dataclass, since `dataclasses` is a large
+    part of their startup.
+    """
+
+    names: tuple[str, ...]  # All entries, in listing order
+    file_names: frozenset[str]
+    dir_names: tuple[str, ...]  # Entries that are directories (or links to one), in listing order
+    symlink_names: frozenset[str]
+
+
 def is_hidden_dir(dir_name: str) -> bool:
     return dir_name.startswith(".")
 
@@ -5,3 +27,44 @@ def is_hidden_dir(dir_name: str) -> bool:
 def is_blacklisted_dir(dir_name: str) -> bool:
     black_list = ["__pycache__", "venv", "env", "build"]
     return dir_name in black_list
+
+
+def scan_dir(dir_abs_path: Path) -> DirSnapshotDto:
+    """List a directory once, keeping the entry types that `os.scandir` already knows."""
+    names: list[str] = []
+    file_names: set[str] = set()
+    dir_names: list[str] = []
+    symlink_names: set[str] = set()
+
+    with os.scandir(dir_abs_path) as entries:
+        for entry in entries:
+            names.append(entry.name)
+
+            if _is_dir(entry):
+                dir_names.append(entry.name)
+            elif _is_file(entry):
+                file_names.add(entry.name)
+
+            if entry.is_symlink():
+                symlink_names.add(entry.name)
+
+    return DirSnapshotDto(
+        names=tuple(names),
+        file_names=frozenset(file_names),
+        dir_names=tuple(dir_names),
+        symlink_names=frozenset(symlink_names),
+    )
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _is_file(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+
+def get_changed_paths(ref: str) -> tuple[set[str], set[str]] | None:
+    """Return paths changed since `ref` as (existing, removed), relative to the working directory.
+
+    Staged, unstaged and untracked changes are included, a rename counts as a removal plus an addition.
+    Returns None when git is unavailable, the directory is not in a repository or the ref is unknown.
+    """
+    diff_output = _run_git(["diff", "--name-status", "-z", "-M", "--relative", ref, "--"])
+    untracked_output = _run_git(["ls-files", "--others", "--exclude-standard", "-z"])
+
+    if diff_output is None or untracked_output is None:
+        return None
+
+    existing_paths = {path for path in untracked_output.split("\0") if path}
+    removed_paths: set[str] = set()
+    fields = diff_output.split("\0")
+    index = 0
+
+    while index < len(fields) and fields[index]:
+        status = fields[index][0]
+
+        if status in ("R", "C"):
+            old_path, new_path = fields[index + 1], fields[index + 2]
+            existing_paths.add(new_path)
+            if status == "R":
+                removed_paths.add(old_path)
+            index += 3
+            continue
+
+        path = fields[index + 1]
+        if status == "D":
+            removed_paths.add(path)
+        else:
+            existing_paths.add(path)
+        index += 2
+
+    return existing_paths, removed_paths
+
+
+def _run_git(args: list[str]) -> str | None:
+    # Most runs never ask git anything, they should not pay for the import
+    import subprocess
+
+    try:
+        result = subprocess.run(["git", *args], capture_output=True, text=True, check=False)  # noqa: S603, S607
+    except OSError:
+        return None
+
+    return result.stdout if result.returncode == 0 else None
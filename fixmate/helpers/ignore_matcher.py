@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_TTrieNode = dict  # Maps a character to the next node, and "" to the validators of the rule ending there
+
+
+class IgnoreMatcher:
+    """Resolve ignored validators for a path from `per-file-ignores` / `per-dir-ignores` style rules.
+
+    A rule applies when its pattern matches the path with `fnmatch` or when the path starts with the pattern.
+    """
+
+    def __init__(self, rules: dict[str, list[str]]) -> None:
+        self._glob_groups = self._compile_glob_groups(rules)
+        self._prefix_trie = self._build_prefix_trie(rules)
+        self._dir_prefix_states: dict[str, tuple[_TTrieNode | None, frozenset[str]]] = {}
+
+    def match(self, path: Path | str) -> set[str]:
+        path_str = str(path)
+        ignored_validators = set(self._match_prefixes(path_str))
+        norm_path_str = os.path.normcase(path_str)
+
+        for pattern, validators in self._glob_groups:
+            if pattern.match(norm_path_str):
+                ignored_validators.update(validators)
+
+        return ignored_validators
+
+    def _match_prefixes(self, path_str: str) -> frozenset[str]:
+        dir_part, sep, name_part = path_str.rpartition(os.sep)
+        dir_part += sep
+
+        # Sibling paths share the walk through their parent directory, so it is done once per directory
+        if dir_part not in self._dir_prefix_states:
+            root_matched = self._prefix_trie.get("", frozenset())
+            self._dir_prefix_states[dir_part] = self._walk_trie(self._prefix_trie, dir_part, root_matched)
+
+        node, matched = self._dir_prefix_states[dir_part]
+        if node is None:
+            return matched
+
+        return self._walk_trie(node, name_part, matched)[1]
+
+    @staticmethod
+    def _walk_trie(node: _TTrieNode, text: str, matched: frozenset[str]) -> tuple[_TTrieNode | None, frozenset[str]]:
+        current: _TTrieNode | None = node
+
+        for char in text:
+            current = node.get(char)
+            if current is None:
+                break
+
+            node = current
+            if "" in node:
+                matched |= node[""]
+
+        return current, matched
+
+    @staticmethod
+    def _compile_glob_groups(rules: dict[str, list[str]]) -> list[tuple[re.Pattern[str], frozenset[str]]]:
+        """Combine the patterns sharing the same validators into a single regex alternation."""
+        patterns_by_validators: dict[frozenset[str], list[str]] = {}
+
+        for pattern, validators in rules.items():
+            translated = fnmatch.translate(os.path.normcase(pattern))
+            patterns_by_validators.setdefault(frozenset(validators), []).append(f"(?:{translated})")
+
+        return [(re.compile("|".join(patterns)), validators) for validators, patterns in patterns_by_validators.items()]
+
+    @staticmethod
+    def _build_prefix_trie(rules: dict[str, list[str]]) -> _TTrieNode:
+        root: _TTrieNode = {}
+
+        for pattern, validators in rules.items():
+            node = root
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[""] = node.get("", frozenset()) | frozenset(validators)
+
+        return root
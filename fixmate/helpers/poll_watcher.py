@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_TSnapshot = dict[Path, tuple[int, int]]
+
+
+class PollWatcher:
+    """Detect changes under some directories by polling a stat snapshot of their files and sub-directories.
+
+    Plain polling works on every platform and filesystem without a native dependency, and pruning the same
+    directories as the checkers keeps each poll cheap. A directory's mtime moves when entries are added,
+    removed or renamed in it, so these show up as changes of the directory too.
+    """
+
+    def __init__(self, should_check_dir: Callable[[str], bool], *, interval: float = 1.0) -> None:
+        self._should_check_dir = should_check_dir
+        self._interval = interval
+
+    def watch(self, root_abs_paths: list[Path]) -> Iterator[set[Path]]:
+        """Yield the paths added, removed or modified since the previous poll, whenever there are some."""
+        previous_snapshot = self.snapshot(root_abs_paths)
+
+        while True:
+            time.sleep(self._interval)
+            snapshot = self.snapshot(root_abs_paths)
+            changed_paths = {
+                path
+                for path in previous_snapshot.keys() | snapshot.keys()
+                if previous_snapshot.get(path) != snapshot.get(path)
+            }
+            previous_snapshot = snapshot
+
+            if changed_paths:
+                yield changed_paths
+
+    def snapshot(self, root_abs_paths: list[Path]) -> _TSnapshot:
+        snapshot: _TSnapshot = {}
+        todo = list(root_abs_paths)
+
+        while todo:
+            dir_abs_path = todo.pop()
+
+            with suppress(OSError):
+                snapshot[dir_abs_path] = self._get_stamp(dir_abs_path.stat())
+
+                with os.scandir(dir_abs_path) as entries:
+                    for entry in entries:
+                        self._add_entry(snapshot, todo, dir_abs_path, entry)
+
+        return snapshot
+
+    def _add_entry(self, snapshot: _TSnapshot, todo: list[Path], dir_abs_path: Path, entry: os.DirEntry) -> None:
+        # Entries can vanish between the listing and the stat, they will be missing from the next poll anyway
+        with suppress(OSError):
+            if entry.is_dir(follow_symlinks=False):
+                if self._should_check_dir(entry.name):
+                    todo.append(dir_abs_path / entry.name)
+            elif entry.is_file():
+                snapshot[dir_abs_path / entry.name] = self._get_stamp(entry.stat())
+
+    @staticmethod
+    def _get_stamp(stat: os.stat_result) -> tuple[int, int]:
+        return (stat.st_mtime_ns, stat.st_size)
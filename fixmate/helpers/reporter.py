@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import sys
+import time
+from typing import TYPE_CHECKING, Callable, NoReturn, TextIO, TypeVar
+
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import Iterable
+
+_T = TypeVar("_T")
+
+_BATCH_SIZE = 1024
+_FLUSH_INTERVAL = 0.1  # Seconds a written error may wait in a batch before the batch is flushed
+
+
+def report_errors(
+    errors: Iterable[_T],
+    logger: logging.Logger,
+    max_errors: int | None = None,
+    *,
+    formatter: Callable[[_T], str] = str,
+    stream: TextIO | None = None,
+) -> NoReturn:
+    """Write errors as they come in and exit, stopping early once `max_errors` errors were written."""
+    if log_errors(errors, logger, max_errors, formatter=formatter, stream=stream):
+        raise SystemExit(1)
+
+    logger.info("All checks passed")
+    raise SystemExit(0)
+
+
+def parse_max_errors(value: str) -> int:
+    """Argparse type of `--max-errors`, a limit below one error would stop before checking anything."""
+    import argparse
+
+    try:
+        max_errors = int(value)
+    except ValueError:
+        msg = f"expected a whole number, got {value!r}"
+        raise argparse.ArgumentTypeError(msg) from None
+
+    if max_errors < 1:
+        msg = f"expected at least 1, got {max_errors}"
+        raise argparse.ArgumentTypeError(msg)
+
+    return max_errors
+
+
+def log_errors(
+    errors: Iterable[_T],
+    logger: logging.Logger,
+    max_errors: int | None = None,
+    *,
+    formatter: Callable[[_T], str] = str,
+    stream: TextIO | None = None,
+) -> int:
+    """Write errors to stdout as they come in, up to `max_errors`, and return how many were written.
+
+    Errors are only formatted here, and written in batches rather than one by one through logging. A batch is
+    flushed once it is full or has waited long enough, so slow checks still show their errors as they go.
+    """
+    stream = stream or sys.stdout
+    error_count = 0
+    batch: list[str] = []
+    flushed_at = time.monotonic()
+    error_iter = iter(errors)
+    is_cut_off = False
+
+    for error in error_iter:
+        batch.append(formatter(error))
+        error_count += 1
+
+        if max_errors and error_count >= max_errors:
+            # Only another error tells that some were left out, rather than exactly as many as the limit
+            is_cut_off = next(error_iter, None) is not None
+            break
+
+        if len(batch) >= _BATCH_SIZE or time.monotonic() - flushed_at >= _FLUSH_INTERVAL:
+            _write_batch(batch, stream)
+            flushed_at = time.monotonic()
+
+    _write_batch(batch, stream)
+
+    if is_cut_off:
+        logger.error("Stopped early, the limit of %s errors was reached", error_count)
+
+    return error_count
+
+
+def _write_batch(batch: list[str], stream: TextIO) -> None:
+    if batch:
+        stream.write("\n".join(batch) + "\n")
+        stream.flush()
+        batch.clear()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from contextlib import suppress
+from pathlib import Path
+
+CACHE_DIR_NAME = ".fixmate_cache"
+
+
+class ResultCache:
+    """On-disk key/value store for check results, safe for concurrent readers and writers."""
+
+    _entry_suffix = ".json"
+    _evict_interval = 60 * 60  # Seconds, scanning every entry costs more than a whole run on a warm cache
+    _evict_after_share = 0.125  # Share of `max_size` an instance may write before it evicts without waiting
+
+    def __init__(
+        self, base_dir: Path, namespace: str, max_size: int = 64 * 1024 * 1024, max_age: float | None = None
+    ) -> None:
+        self._root_dir = base_dir / CACHE_DIR_NAME
+        self._cache_dir = self._root_dir / namespace
+        self._evicted_marker_path = self._root_dir / f"{namespace}.evicted"  # Its mtime is that of the last eviction
+        self._max_size = max_size
+        self._max_age = max_age  # Seconds an entry may go unused before it counts as stale
+        self._written_size = 0  # Disk usage of the entries written since this instance last evicted
+        self._version = self._get_version()
+        self._is_ready = False
+
+    def make_key(self, *parts: str | bytes) -> str:
+        hasher = hashlib.sha256(self._version.encode())
+
+        for part in parts:
+            hasher.update(b"\0")
+            hasher.update(part.encode() if isinstance(part, str) else part)
+
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> list | None:
+        entry_path = self._get_entry_path(key)
+
+        try:
+            value = json.loads(entry_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        # Refresh the mtime so eviction drops the least recently used entries first
+        with suppress(OSError):
+            os.utime(entry_path)
+
+        return value if isinstance(value, list) else None
+
+    def set(self, key: str, value: list) -> None:
+        import tempfile
+
+        with suppress(OSError):
+            self._prepare_dir()
+            file_descriptor, tmp_path_str = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            tmp_path = Path(tmp_path_str)
+
+            try:
+                with os.fdopen(file_descriptor, "w") as file_obj:
+                    json.dump(value, file_obj)
+                self._written_size += self._get_disk_size(tmp_path.stat())
+                # An atomic rename lets parallel writers race without readers ever seeing a partial entry
+                tmp_path.replace(self._get_entry_path(key))
+            except OSError:
+                tmp_path.unlink(missing_ok=True)
+
+        # A cold run over a large tree can write far more than the limit before the next due eviction
+        if self._written_size > self._max_size * self._evict_after_share:
+            self._evict_now()
+
+    def evict(self) -> None:
+        """Drop stale entries, then the least recently used ones once the cache grows past its size limit.
+
+        The entries are only scanned when some were added since the previous eviction and that one is older
+        than `_evict_interval`, so most runs only stat two paths. Entries are written by worker processes too,
+        which the directory mtime accounts for, as it moves whenever an entry is renamed into it. In between,
+        every writer evicts by itself once it wrote an eighth of the limit, which keeps the cache bounded.
+        """
+        if self._is_eviction_due():
+            self._evict_now()
+
+    def _evict_now(self) -> None:
+        self._evict_entries()
+        self._written_size = 0
+
+        with suppress(OSError):
+            self._evicted_marker_path.touch()
+
+    def _is_eviction_due(self) -> bool:
+        try:
+            added_at = self._cache_dir.stat().st_mtime
+        except OSError:
+            return False  # Nothing was ever written
+
+        try:
+            evicted_at = self._evicted_marker_path.stat().st_mtime
+        except OSError:
+            return True
+
+        return added_at > evicted_at and time.time() - evicted_at >= self._evict_interval
+
+    def _evict_entries(self) -> None:
+        entries: list[tuple[float, int, Path]] = []
+        stale_before = time.time() - self._max_age if self._max_age is not None else None
+
+        try:
+            with os.scandir(self._cache_dir) as dir_entries:
+                for entry in dir_entries:
+                    with suppress(OSError):
+                        stat = entry.stat()
+                        if stale_before is not None and stat.st_mtime < stale_before:
+                            (self._cache_dir / entry.name).unlink()
+                        else:
+                            entries.append((stat.st_mtime, self._get_disk_size(stat), self._cache_dir / entry.name))
+        except OSError:
+            return
+
+        total_size = sum(size for _, size, _ in entries)
+        if total_size <= self._max_size:
+            return
+
+        target_size = self._max_size * 0.8
+
+        for _, size, path in sorted(entries):
+            if total_size <= target_size:
+                break
+
+            # Another process may have already removed or replaced the entry
+            with suppress(OSError):
+                path.unlink()
+            total_size -= size
+
+    def _prepare_dir(self) -> None:
+        if self._is_ready:
+            return
+
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        gitignore_path = self._root_dir / ".gitignore"
+
+        with suppress(FileExistsError), gitignore_path.open("x") as file_obj:
+            file_obj.write("# Automatically created by fixmate\n*\n")
+
+        self._is_ready = True
+
+    def _get_entry_path(self, key: str) -> Path:
+        return self._cache_dir / f"{key}{self._entry_suffix}"
+
+    @staticmethod
+    def _get_disk_size(stat: os.stat_result) -> int:
+        """Return the space a file takes on disk, a whole block even for the few bytes of most entries."""
+        blocks = getattr(stat, "st_blocks", None)
+        return blocks * 512 if blocks is not None else stat.st_size
+
+    @staticmethod
+    def _get_version() -> str:
+        """Return a stamp of fixmate's own sources, so entries made by any other code never match.
+
+        Stating the few source files is much cheaper than importing `importlib.metadata` for the version, and
+        also catches changes that keep the version, like in an editable install.
+        """
+        package_dir = Path(__file__).resolve().parent.parent
+        hasher = hashlib.sha256()
+
+        for source_path in sorted(package_dir.glob("**/*.py")):
+            with suppress(OSError):
+                stat = source_path.stat()
+                hasher.update(f"{source_path.relative_to(package_dir)}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode())
+
+        return hasher.hexdigest()
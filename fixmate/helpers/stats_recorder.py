@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import heapq
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, TypeVar
+
+if sys.platform != "win32":
+    import resource
+
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import Iterable, Iterator
+
+_T = TypeVar("_T")
+_SENTINEL = object()
+
+
+class StatsRecorder:
+    """Collect wall and CPU time per phase and per validator, along with the slowest files or directories of a run.
+
+    Checkers hold an optional recorder and skip every measurement when they have none, so the hooks cost
+    nothing on regular runs. Times recorded in worker processes are merged in, hence add up across workers.
+    """
+
+    def __init__(self, slowest_count: int = 10) -> None:
+        self._slowest_count = slowest_count
+        self._phases: dict[str, list[float]] = {}  # Name to [wall, cpu, calls]
+        self._validators: dict[str, list[float]] = {}
+        self._slowest_paths: list[tuple[float, str]] = []  # Min-heap, the fastest of the slowest on top
+        self._path_count = 0
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        with self._measure(self._phases, name):
+            yield
+
+    @contextmanager
+    def validator(self, error_code: str) -> Iterator[None]:
+        with self._measure(self._validators, error_code):
+            yield
+
+    def time_iter(self, name: str, iterable: Iterable[_T]) -> Iterator[_T]:
+        """Yield from `iterable`, charging the time spent producing each item to the `name` phase."""
+        iterator = iter(iterable)
+
+        while True:
+            with self.phase(name):
+                item = next(iterator, _SENTINEL)
+
+            if item is _SENTINEL:
+                return
+
+            yield item  # type: ignore[misc]
+
+    def record_path(self, path: str, seconds: float) -> None:
+        self._path_count += 1
+        self._keep_if_slow(seconds, path)
+
+    def fork(self) -> StatsRecorder:
+        """Return an empty recorder with the same settings, for a worker to fill and send back."""
+        return StatsRecorder(self._slowest_count)
+
+    def merge(self, other: StatsRecorder) -> None:
+        for own_timings, other_timings in ((self._phases, other._phases), (self._validators, other._validators)):
+            for name, (wall, cpu, calls) in other_timings.items():
+                timing = own_timings.setdefault(name, [0.0, 0.0, 0])
+                timing[0] += wall
+                timing[1] += cpu
+                timing[2] += calls
+
+        for seconds, path in other._slowest_paths:
+            self._keep_if_slow(seconds, path)
+
+        self._path_count += other._path_count
+
+    def summary(self) -> dict:
+        wall = time.perf_counter() - self._start_wall
+        return {
+            "wall": wall,
+            "cpu": time.process_time() - self._start_cpu,
+            "paths": self._path_count,
+            "paths_per_sec": self._path_count / wall if wall else 0.0,
+            "peak_memory_mib": self._get_peak_memory_mib(),
+            "phases": self._format_timings(self._phases),
+            "validators": self._format_timings(self._validators),
+            "slowest_paths": [
+                {"path": path, "wall": seconds} for seconds, path in sorted(self._slowest_paths, reverse=True)
+            ],
+        }
+
+    def log_summary(self, logger: logging.Logger, output_format: str = "table") -> None:
+        summary = self.summary()
+
+        if output_format == "json":
+            logger.info(json.dumps(summary, indent=2))
+            return
+
+        peak_memory = summary["peak_memory_mib"]
+        logger.info(
+            "Checked %s paths in %.3fs (%.3fs CPU, %.1f paths/sec, peak memory %s)",
+            summary["paths"],
+            summary["wall"],
+            summary["cpu"],
+            summary["paths_per_sec"],
+            f"{peak_memory:.1f} MiB" if peak_memory is not None else "unknown",
+        )
+
+        for title in ("phases", "validators"):
+            if summary[title]:
+                logger.info("%-32s %10s %10s %8s", title.capitalize(), "Wall", "CPU", "Calls")
+            for name, timing in summary[title].items():
+                logger.info("  %-30s %9.3fs %9.3fs %8d", name, timing["wall"], timing["cpu"], timing["calls"])
+
+        if summary["slowest_paths"]:
+            logger.info("Slowest paths")
+        for path_stats in summary["slowest_paths"]:
+            logger.info("  %9.3fs %s", path_stats["wall"], path_stats["path"])
+
+    def _keep_if_slow(self, seconds: float, path: str) -> None:
+        if len(self._slowest_paths) < self._slowest_count:
+            heapq.heappush(self._slowest_paths, (seconds, path))
+        else:
+            heapq.heappushpop(self._slowest_paths, (seconds, path))
+
+    @contextmanager
+    def _measure(self, timings: dict[str, list[float]], name: str) -> Iterator[None]:
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+
+        try:
+            yield
+        finally:
+            timing = timings.setdefault(name, [0.0, 0.0, 0])
+            timing[0] += time.perf_counter() - start_wall
+            timing[1] += time.process_time() - start_cpu
+            timing[2] += 1
+
+    @staticmethod
+    def _format_timings(timings: dict[str, list[float]]) -> dict[str, dict[str, float]]:
+        return {
+            name: {"wall": wall, "cpu": cpu, "calls": int(calls)}
+            for name, (wall, cpu, calls) in sorted(timings.items(), key=lambda item: -item[1][0])
+        }
+
+    @staticmethod
+    def _get_peak_memory_mib() -> float | None:
+        if sys.platform == "win32":
+            return None
+
+        # Worker processes count too, the largest of all is the peak a machine has to provide for
+        peak = max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        )
+        # Reported in bytes on macOS and in kibibytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+from fixmate.helpers.dir_tools import DirSnapshotDto, scan_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from concurrent.futures import Future, ThreadPoolExecutor
+    from pathlib import Path
+
+
+class TreeWalker:
+    """Walk a directory tree top-down in sorted order, yielding each directory with its snapshot and link status.
+
+    With more than one thread, directories are listed ahead of time in a thread pool, which hides the
+    round-trip latency of network filesystems, while the results keep the same order as a serial walk.
+    Like `os.walk`, directories that cannot be listed, unreadable or removed in the meantime, are skipped.
+    """
+
+    def __init__(
+        self, should_check_dir: Callable[[str], bool], *, threads: int = 1, include_symlinks: bool = False
+    ) -> None:
+        self._should_check_dir = should_check_dir
+        self._threads = max(threads, 1)
+        self._include_symlinks = include_symlinks  # Yield links to directories, without walking into them
+
+    def walk(self, root_abs_path: Path) -> Iterator[tuple[Path, DirSnapshotDto, bool]]:
+        if self._threads == 1:
+            yield from self._walk_serial(root_abs_path)
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=self._threads)
+
+        try:
+            yield from self._walk_concurrent(root_abs_path, executor)
+        finally:
+            # A caller stopping early, like at `--max-errors`, must not wait for the listings still queued
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _walk_serial(self, root_abs_path: Path) -> Iterator[tuple[Path, DirSnapshotDto, bool]]:
+        todo = [(root_abs_path, False)]
+
+        while todo:
+            dir_abs_path, is_symlink = todo.pop()
+            dir_snapshot = self._scan_dir(dir_abs_path)
+            if dir_snapshot is None:
+                continue
+
+            yield dir_abs_path, dir_snapshot, is_symlink
+
+            if not is_symlink:
+                todo.extend(reversed(self._get_sub_dirs(dir_abs_path, dir_snapshot)))
+
+    def _walk_concurrent(
+        self, root_abs_path: Path, executor: ThreadPoolExecutor
+    ) -> Iterator[tuple[Path, DirSnapshotDto, bool]]:
+        todo: list[tuple[Path, bool, Future[DirSnapshotDto | None]]] = [
+            (root_abs_path, False, executor.submit(self._scan_dir, root_abs_path))
+        ]
+
+        while todo:
+            dir_abs_path, is_symlink, future = todo.pop()
+            dir_snapshot = future.result()
+            if dir_snapshot is None:
+                continue
+
+            yield dir_abs_path, dir_snapshot, is_symlink
+
+            if not is_symlink:
+                sub_dirs = self._get_sub_dirs(dir_abs_path, dir_snapshot)
+                todo.extend((path, link, executor.submit(self._scan_dir, path)) for path, link in reversed(sub_dirs))
+
+    def _get_sub_dirs(self, dir_abs_path: Path, dir_snapshot: DirSnapshotDto) -> list[tuple[Path, bool]]:
+        sub_dirs = []
+
+        for dir_name in sorted(dir_snapshot.dir_names):
+            is_symlink = dir_name in dir_snapshot.symlink_names
+
+            if self._should_check_dir(dir_name) and (self._include_symlinks or not is_symlink):
+                sub_dirs.append((dir_abs_path / dir_name, is_symlink))
+
+        return sub_dirs
+
+    @staticmethod
+    def _scan_dir(dir_abs_path: Path) -> DirSnapshotDto | None:
+        try:
+            return scan_dir(dir_abs_path)
+        except OSError:
+            return None
@@ -10,10 +10,18 @@ def main() -> None:
 
     parser = argparse.ArgumentParser(description="Just modules indexer")
     parser.add_argument("--config", type=Path, help="Path to pyproject.toml file")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the cached configuration")
+    parser.add_argument("--watch", action="store_true", help="Keep the index files up to date until interrupted")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between two polls in watch mode")
     parser.add_argument("dirs", nargs="*", help="Directories to check")
     args = parser.parse_args()
 
-    JustIndexer(config_path=args.config).run(root_dirs=args.dirs)
+    if args.watch:
+        JustIndexer(config_path=args.config, use_cache=not args.no_cache).watch(
+            root_dirs=args.dirs, interval=args.interval
+        )
+    else:
+        JustIndexer(config_path=args.config, use_cache=not args.no_cache).run(root_dirs=args.dirs)
 
 
 if __name__ == "__main__":
@@ -1,32 +1,72 @@
 from __future__ import annotations
 
 import logging
+from fnmatch import fnmatchcase
 from pathlib import Path
 
 from fixmate.helpers.config_loader import load_configs
+from fixmate.helpers.dir_tools import is_blacklisted_dir, is_hidden_dir, scan_dir
 
 
 class JustIndexer:
-    def __init__(self, config_path: Path | None = None) -> None:
+    _max_threads = 8
+
+    def __init__(self, config_path: Path | None = None, *, use_cache: bool = True) -> None:
         config_path = config_path or Path("pyproject.toml")
-        self._configs = load_configs(config_path, "just_indexer")
-        self._output_file_name = self._get_output_file_name()
-        self._modules_optional = self._get_modules_optionality()
-        self._include_patterns = self._get_include_patterns()
+        self._configs = load_configs(config_path, "just_indexer", use_cache=use_cache)
+        self._output_file_name: str = self._configs["output-file-name"]
+        self._modules_optional: bool = self._configs["modules-optional"]
+        self._include_patterns: list[str] = self._configs["include-patterns"]
         self._logger = logging.getLogger(__name__)
 
     def run(self, root_dirs: list[Path | str] | None = None) -> None:
         resolved_root_dirs = [Path(root_dir) for root_dir in (root_dirs or [])]
-        generated_files = []
-
-        for root_dir in resolved_root_dirs:
-            generated_file = self._generate_index_file(root_dir)
-            generated_files.append(generated_file)
 
-        generated_files_str = ", ".join(str(f) for f in generated_files)
-        self._logger.info("Generated index files: %s", generated_files_str)
+        if not self._generate_index_files(resolved_root_dirs) and resolved_root_dirs:
+            self._logger.info("Index files are up to date")
 
-    def _generate_index_file(self, root_dir: Path) -> Path:
+    def watch(self, root_dirs: list[Path | str] | None = None, interval: float = 1.0) -> None:
+        """Keep the index files up to date, regenerating those whose root directory changed, until interrupted."""
+        resolved_root_dirs = [Path(root_dir) for root_dir in (root_dirs or [])]
+        root_abs_paths = [root_dir.resolve() for root_dir in resolved_root_dirs]
+        from fixmate.helpers.poll_watcher import PollWatcher
+
+        watcher = PollWatcher(self._should_check_dir, interval=interval)
+        self._generate_index_files(resolved_root_dirs)
+        self._logger.info("Watching %s for changes", ", ".join(str(d) for d in resolved_root_dirs))
+
+        try:
+            for changed_paths in watcher.watch(root_abs_paths):
+                changed_root_dirs = [
+                    root_dir
+                    for root_dir, root_abs_path in zip(resolved_root_dirs, root_abs_paths)
+                    if any(path == root_abs_path or root_abs_path in path.parents for path in changed_paths)
+                ]
+                self._generate_index_files(changed_root_dirs)
+        except KeyboardInterrupt:
+            self._logger.info("Stopped watching")
+
+    def _generate_index_files(self, root_dirs: list[Path]) -> list[Path]:
+        if len(root_dirs) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # Roots are independent of each other, their scans and writes overlap on slow filesystems
+            with ThreadPoolExecutor(max_workers=min(len(root_dirs), self._max_threads)) as executor:
+                results = list(executor.map(self._generate_index_file, root_dirs))
+        else:
+            # A single root, the usual hook call, needs no thread nor the import of the pool
+            results = [self._generate_index_file(root_dir) for root_dir in root_dirs]
+
+        generated_files = [output_path for output_path, is_written in results if is_written]
+
+        if generated_files:
+            generated_files_str = ", ".join(str(f) for f in generated_files)
+            self._logger.info("Generated index files: %s", generated_files_str)
+
+        return generated_files
+
+    def _generate_index_file(self, root_dir: Path) -> tuple[Path, bool]:
+        """Write the index file of a root directory, unless it already has the right content."""
         modules = []
         files = self._get_files_to_index(root_dir)
 
@@ -39,35 +79,40 @@ class JustIndexer:
 
         content = "\n".join([*header, *modules]) + "\n"
         output_path = root_dir / self._output_file_name
+
+        # Rewriting an identical file would still bump its mtime and wake up every watcher of the directory
+        if self._read_text(output_path) == content:
+            return output_path, False
+
         output_path.write_text(content)
-        return output_path
+        return output_path, True
 
     def _get_files_to_index(self, root_dir: Path) -> list[Path]:
         files: set[Path] = set()
+        name_patterns = [pattern for pattern in self._include_patterns if "/" not in pattern]
+        path_patterns = [pattern for pattern in self._include_patterns if "/" in pattern]
 
-        for pattern in self._include_patterns:
+        # Patterns matching plain file names share a single listing of the directory
+        if name_patterns:
+            dir_snapshot = scan_dir(root_dir)
+            for file_name in dir_snapshot.file_names:
+                if any(fnmatchcase(file_name, pattern) for pattern in name_patterns):
+                    files.add(root_dir / file_name)
+
+        for pattern in path_patterns:
             for file in root_dir.glob(pattern):
                 if file.is_file():
                     files.add(file)
 
         return sorted(files)
 
-    def _get_output_file_name(self) -> str:
-        value = self._configs.get("output-file-name")
-        default_value = "_index.just"
-        return value if isinstance(value, str) and value else default_value
-
-    def _get_modules_optionality(self) -> bool:
-        value = self._configs.get("modules-optional")
-        default_value = True
-        return value if isinstance(value, bool) else default_value
-
-    def _get_include_patterns(self) -> list[str]:
-        value = self._configs.get("include-patterns")
-        default_value = ["[!_]*.just"]
-
-        if not isinstance(value, list):
-            return default_value
+    @staticmethod
+    def _should_check_dir(dir_name: str) -> bool:
+        return not is_hidden_dir(dir_name) and not is_blacklisted_dir(dir_name)
 
-        sanitized_patterns = [pattern for pattern in value if isinstance(pattern, str) and pattern]
-        return sanitized_patterns or default_value
+    @staticmethod
+    def _read_text(file_path: Path) -> str | None:
+        try:
+            return file_path.read_text()
+        except (OSError, UnicodeDecodeError):
+            return None
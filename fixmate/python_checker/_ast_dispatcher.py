@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import ast
+from collections import deque
+from typing import TYPE_CHECKING, Protocol
+
+from fixmate.python_checker._dto import AstNodeDto
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from fixmate.python_checker._dto import FileSpecsDto
+
+
+class AstValidator(Protocol):
+    error_code: str
+    node_types: tuple[type[ast.AST], ...]
+
+    def may_apply(self, source: bytes, file_rel_path: Path) -> bool:
+        """Tell from the raw source whether the validator could report anything, without false negatives."""
+
+    def validate(self, nodes: list[AstNodeDto], file_specs: FileSpecsDto) -> None: ...
+
+
+class AstDispatcher:
+    _scope_types = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+    def dispatch(self, tree: ast.AST, validators: Sequence[AstValidator]) -> list[list[AstNodeDto]]:
+        """Walk the tree once and collect, per validator, the nodes of the types it registered for.
+
+        Nodes are visited in the same breadth-first order as `ast.walk`. The enclosing scope travels with each
+        queued node, so no parent links are stored on the tree and deeply nested code needs no recursion.
+        """
+        buckets: list[list[AstNodeDto]] = [[] for _ in validators]
+        routes: dict[type[ast.AST], list[list[AstNodeDto]]] = {}
+
+        for validator, bucket in zip(validators, buckets):
+            for node_type in validator.node_types:
+                routes.setdefault(node_type, []).append(bucket)
+
+        todo: deque[tuple[ast.AST, str, bool]] = deque([(tree, "global", False)])
+
+        while todo:
+            node, scope, is_file_level = todo.popleft()
+            children_scope = node.name if isinstance(node, self._scope_types) else scope
+            children_are_file_level = isinstance(node, ast.Module)
+            todo.extend((child, children_scope, children_are_file_level) for child in ast.iter_child_nodes(node))
+
+            node_buckets = routes.get(type(node))
+            if node_buckets:
+                node_dto = AstNodeDto(node=node, scope=scope, is_file_level=is_file_level)
+                for bucket in node_buckets:
+                    bucket.append(node_dto)
+
+        return buckets
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import os
+import stat
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from fixmate.python_checker._error_record import ErrorRecord
+
+if TYPE_CHECKING:
+    import socket
+
+
+class DaemonClient:
+    """Forward a check to a running `python_checker --daemon` of the current directory."""
+
+    _connect_timeout = 1.0  # Seconds, a live daemon accepts right away even while busy with another check
+    _response_timeout = 30.0  # Seconds, beyond which checking in-process is faster than waiting for a stuck daemon
+
+    def check(
+        self, files_to_check: list[str], config_path: Path | None, changed_since: str | None = None
+    ) -> list[ErrorRecord] | None:
+        """Return the errors found by the daemon, or None when no daemon could serve the request."""
+        socket_path = self.get_socket_path()
+        if socket_path is None or not self.is_owned_socket(socket_path):
+            return None
+
+        # Without a daemon around, which is the common case, none of these modules is even imported
+        import json
+        import socket
+
+        request = {
+            "cwd": str(Path.cwd()),
+            "config": self.resolve_config_path(config_path),
+            "files": files_to_check,
+            "changed_since": changed_since,
+        }
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.settimeout(self._connect_timeout)
+                client.connect(str(socket_path))
+                client.settimeout(self._response_timeout)
+                client.sendall(json.dumps(request).encode())
+                client.shutdown(socket.SHUT_WR)
+                response = json.loads(self.receive_all(client))
+        except (OSError, ValueError):
+            return None
+
+        rows = response.get("errors") if isinstance(response, dict) else None
+        if not isinstance(rows, list):
+            return None
+
+        try:
+            return [ErrorRecord.from_row(row) for row in rows]
+        except (TypeError, ValueError, KeyError):
+            return None
+
+    def is_running(self) -> bool:
+        socket_path = self.get_socket_path()
+        if socket_path is None or not self.is_owned_socket(socket_path):
+            return False
+
+        import socket
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.settimeout(self._connect_timeout)
+                client.connect(str(socket_path))
+        except OSError:
+            return False
+
+        return True
+
+    @classmethod
+    def get_socket_path(cls, *, create_dir: bool = False) -> Path | None:
+        """Return the socket of the daemon serving the current directory.
+
+        Sockets live in a directory only the current user can enter, so other users can neither take the place
+        of a daemon nor talk to one. None is returned without Unix sockets or when that directory is not private.
+        """
+        if os.name != "posix":
+            return None
+
+        socket_dir = cls._get_socket_dir()
+        if create_dir:
+            try:
+                socket_dir.mkdir(mode=0o700, exist_ok=True)
+            except OSError:
+                return None
+
+        if not cls._is_private_dir(socket_dir):
+            return None
+
+        import hashlib
+
+        # Hashing keeps the path short enough for the socket address limit whatever the directory depth is
+        cwd_hash = hashlib.sha256(str(Path.cwd()).encode()).hexdigest()[:16]
+        return socket_dir / f"{cwd_hash}.sock"
+
+    @staticmethod
+    def is_owned_socket(socket_path: Path) -> bool:
+        try:
+            socket_stat = socket_path.lstat()
+        except OSError:
+            return False
+
+        return stat.S_ISSOCK(socket_stat.st_mode) and socket_stat.st_uid == os.getuid()
+
+    @staticmethod
+    def _get_socket_dir() -> Path:
+        runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+        if runtime_dir:
+            return Path(runtime_dir) / "fixmate"
+
+        # The temporary directory `tempfile` would pick on POSIX, without importing it on every call
+        temp_dir = next(
+            (os.environ[name] for name in ("TMPDIR", "TEMP", "TMP") if os.environ.get(name)),
+            "/tmp",  # noqa: S108
+        )
+        return Path(temp_dir) / f"fixmate-{os.getuid()}"
+
+    @staticmethod
+    def _is_private_dir(dir_path: Path) -> bool:
+        try:
+            dir_stat = dir_path.lstat()
+        except OSError:
+            return False
+
+        return (
+            stat.S_ISDIR(dir_stat.st_mode)
+            and dir_stat.st_uid == os.getuid()
+            and not dir_stat.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+        )
+
+    @staticmethod
+    def resolve_config_path(config_path: Path | None) -> str:
+        return str((config_path or Path("pyproject.toml")).resolve())
+
+    @staticmethod
+    def receive_all(connection: socket.socket) -> bytes:
+        chunks = []
+
+        while True:
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        return b"".join(chunks)
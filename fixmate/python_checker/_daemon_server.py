@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import logging
+import signal
+import socket
+from contextlib import suppress
+from pathlib import Path
+from typing import NoReturn
+
+from fixmate.helpers.config_loader import get_config_stamp
+from fixmate.python_checker._daemon_client import DaemonClient
+from fixmate.python_checker.python_checker import PythonChecker
+
+
+class DaemonServer:
+    """Keep a warm `PythonChecker` resident and serve checks over a local Unix socket."""
+
+    _idle_timeout = 60 * 60
+    _request_timeout = 10  # Seconds a client may take to send its request, so a stuck one cannot block the others
+
+    def __init__(self, config_path: Path | None = None, jobs: int | None = None) -> None:
+        self._config_path = config_path
+        self._jobs = jobs
+        self._client = DaemonClient()
+        self._config_stamp = get_config_stamp(Path(self._client.resolve_config_path(config_path)))
+        self._checker = self._create_checker()
+        self._logger = logging.getLogger(__name__)
+
+    def serve(self) -> None:
+        socket_path = self._client.get_socket_path(create_dir=True)
+
+        if socket_path is None:
+            self._logger.error("Daemon mode needs Unix sockets and a socket directory only this user can access")
+            raise SystemExit(1)
+
+        if self._client.is_running():
+            self._logger.error("A daemon is already serving %s", Path.cwd())
+            raise SystemExit(1)
+
+        # Only a stale socket of this user is replaced, anything else found there is left alone
+        if socket_path.exists() and not self._client.is_owned_socket(socket_path):
+            self._logger.error("%s is not a socket of this user", socket_path)
+            raise SystemExit(1)
+
+        socket_path.unlink(missing_ok=True)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(socket_path))
+            socket_path.chmod(0o600)
+            server.listen()
+            server.settimeout(self._idle_timeout)
+            signal.signal(signal.SIGTERM, self._stop)
+            self._logger.info("Serving checks on %s", socket_path)
+
+            try:
+                self._accept_forever(server)
+            except KeyboardInterrupt:
+                self._logger.info("Daemon stopped")
+            finally:
+                socket_path.unlink(missing_ok=True)
+
+    def _accept_forever(self, server: socket.socket) -> None:
+        while True:
+            try:
+                connection, _ = server.accept()
+            except socket.timeout:
+                self._logger.info("Daemon stopped after being idle for %s seconds", self._idle_timeout)
+                return
+
+            # A client that went away or stalled only loses its own request
+            with connection, suppress(OSError):
+                connection.settimeout(self._request_timeout)
+                response = self._handle(DaemonClient.receive_all(connection))
+                connection.sendall(json.dumps(response).encode())
+
+    def _stop(self, *_: object) -> NoReturn:
+        self._logger.info("Daemon stopped")
+        raise SystemExit(0)
+
+    def _handle(self, raw_request: bytes) -> dict:
+        try:
+            request = json.loads(raw_request)
+        except ValueError:
+            return {"errors": None}
+
+        if not self._is_valid_request(request):
+            self._logger.warning("Ignoring a malformed request")
+            return {"errors": None}
+
+        if request.get("cwd") != str(Path.cwd()) or request.get("config") != self._client.resolve_config_path(
+            self._config_path
+        ):
+            return {"errors": None}
+
+        self._reload_if_config_changed()
+
+        try:
+            errors = self._checker.check(request.get("files") or [], request.get("changed_since"))
+        except Exception:
+            # The client falls back to an in-process run, which reports the failure the usual way
+            self._logger.exception("Check failed")
+            return {"errors": None}
+
+        return {"errors": [error.to_row() for error in errors]}
+
+    @staticmethod
+    def _is_valid_request(request: object) -> bool:
+        if not isinstance(request, dict):
+            return False
+
+        files = request.get("files")
+        changed_since = request.get("changed_since")
+        return (
+            isinstance(files, list)
+            and all(isinstance(file, str) for file in files)
+            and (changed_since is None or isinstance(changed_since, str))
+        )
+
+    def _reload_if_config_changed(self) -> None:
+        config_stamp = get_config_stamp(Path(self._client.resolve_config_path(self._config_path)))
+
+        if config_stamp != self._config_stamp:
+            self._config_stamp = config_stamp
+            self._checker = self._create_checker()
+
+    def _create_checker(self) -> PythonChecker:
+        return PythonChecker(config_path=self._config_path, jobs=self._jobs, keep_results=True)
@@ -1,10 +1,22 @@
-from dataclasses import dataclass
+import ast
 from pathlib import Path
+from typing import NamedTuple
 
+from fixmate.python_checker._error_record import ErrorRecord
 
-@dataclass
-class FileSpecsDto:
-    exec_abs_path: Path
-    abs_path: Path
+
+class FileSpecsDto(NamedTuple):
+    rel_path: Path
+    path: str  # Interned string of rel_path, shared by the error records of the file
+    errors: list[ErrorRecord]
+
+
+class FileResultDto(NamedTuple):
     rel_path: Path
-    errors: list[str]
+    errors: list[ErrorRecord]
+
+
+class AstNodeDto(NamedTuple):
+    node: ast.AST
+    scope: str  # Name of the closest enclosing function or class, "global" at module level
+    is_file_level: bool
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import sys
+from enum import Enum
+from typing import Callable
+
+
+class ErrorKind(Enum):
+    """What went wrong, with the message template the error argument is formatted into."""
+
+    PRIVATE_IMPORT = "invalid import of private module '{}'"
+    PUBLIC_FUNCTION = "top-level public function '{}' is not allowed in a public module"
+    LOG_LOWERCASE = "log '{}' starts with lowercase"
+    EXCEPTION_UPPERCASE = "exception '{}' starts with uppercase"
+    EXCEPTION_PUNCTUATION = "exception '{}' ends with punctuation"
+    INVALID_SYNTAX = "invalid syntax: {}"
+
+
+class ErrorRecord:
+    """A validation error kept as its parts, which are only formatted when the error is output.
+
+    Records of the same file share a single interned path string, and the kind is a shared enum member, so a
+    record costs little more than its line number and argument.
+    """
+
+    __slots__ = ("arg", "code", "kind", "line", "path")
+
+    def __init__(self, path: str, line: int, code: str, kind: ErrorKind, arg: str) -> None:
+        self.path = sys.intern(path)
+        self.line = line
+        self.code = code  # Error code of the validator, empty when no validator raised the error
+        self.kind = kind
+        self.arg = arg
+
+    def __str__(self) -> str:
+        error = f"{self.path}:{self.line}: {self.kind.value.format(self.arg)}"
+        return f"{error} [{self.code}]" if self.code else error
+
+    def __repr__(self) -> str:
+        return f"ErrorRecord({self.path!r}, {self.line!r}, {self.code!r}, {self.kind}, {self.arg!r})"
+
+    @staticmethod
+    def get_formatter(output_format: str) -> Callable[[ErrorRecord], str]:
+        """Return how to print records, as plain text or as JSON lines for machine consumers."""
+        return ErrorRecord.to_json if output_format == "jsonl" else str
+
+    def to_json(self) -> str:
+        import json
+
+        return json.dumps(
+            {
+                "path": self.path,
+                "line": self.line,
+                "code": self.code,
+                "kind": self.kind.name.lower(),
+                "arg": self.arg,
+                "message": str(self),
+            }
+        )
+
+    def to_row(self) -> list:
+        """Return the record as a JSON-compatible row, for the result cache and the daemon."""
+        return [self.path, self.line, self.code, self.kind.name, self.arg]
+
+    @classmethod
+    def from_row(cls, row: list) -> ErrorRecord:
+        """Rebuild a record from a row made by `to_row`, raising TypeError, ValueError or KeyError if malformed."""
+        path, line, code, kind_name, arg = row
+
+        if not (isinstance(path, str) and isinstance(line, int) and isinstance(code, str) and isinstance(arg, str)):
+            msg = f"malformed error row {row!r}"
+            raise TypeError(msg)
+
+        return cls(path, line, code, ErrorKind[kind_name], arg)
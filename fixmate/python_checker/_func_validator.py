@@ -1,31 +1,44 @@
 from __future__ import annotations
 
 import ast
+import re
 from typing import TYPE_CHECKING, cast
 
+from fixmate.python_checker._error_record import ErrorKind, ErrorRecord
+
 if TYPE_CHECKING:
     from pathlib import Path
 
-    from fixmate.python_checker._dto import FileSpecsDto
+    from fixmate.python_checker._dto import AstNodeDto, FileSpecsDto
 
 
 class FuncValidator:
     error_code = "func_validator"
+    node_types: tuple[type[ast.AST], ...] = (ast.FunctionDef, ast.AsyncFunctionDef)
+    # File-level statements start at the first column, decorators sit on lines of their own
+    _public_def_pattern = re.compile(rb"^(?:async\s+)?def\s+(?!_)", re.MULTILINE)
 
-    def validate(self, tree: ast.AST, file_specs: FileSpecsDto) -> None:
-        for node in ast.walk(tree):
-            if not self._is_func(node):
-                continue
+    def may_apply(self, source: bytes, file_rel_path: Path) -> bool:
+        """Tell, without parsing, whether the source may define a top-level public function in a public module."""
+        return self._is_public_module(file_rel_path) and self._public_def_pattern.search(source) is not None
 
-            func_node = cast("ast.FunctionDef | ast.AsyncFunctionDef", node)
+    def validate(self, nodes: list[AstNodeDto], file_specs: FileSpecsDto) -> None:
+        for node_dto in nodes:
+            if not self._is_func(node_dto.node):
+                continue
 
-            if self._is_public(func_node) and self._is_file_level(node) and self._is_public_module(file_specs.rel_path):
-                error = (
-                    f"{file_specs.rel_path}:{func_node.lineno}: "
-                    f"top-level public function '{func_node.name}' is not allowed in a public module "
-                    f"[{self.error_code}]"
+            func_node = cast("ast.FunctionDef | ast.AsyncFunctionDef", node_dto.node)
+
+            if (
+                self._is_public(func_node)
+                and self._is_file_level(node_dto)
+                and self._is_public_module(file_specs.rel_path)
+            ):
+                file_specs.errors.append(
+                    ErrorRecord(
+                        file_specs.path, func_node.lineno, self.error_code, ErrorKind.PUBLIC_FUNCTION, func_node.name
+                    )
                 )
-                file_specs.errors.append(error)
 
     @staticmethod
     def _is_func(node: ast.AST) -> bool:
@@ -36,8 +49,8 @@ class FuncValidator:
         return not func.name.startswith("_")
 
     @staticmethod
-    def _is_file_level(node: ast.AST) -> bool:
-        return isinstance(node.parent, ast.Module)  # type: ignore[attr-defined]
+    def _is_file_level(node_dto: AstNodeDto) -> bool:
+        return node_dto.is_file_level
 
     @staticmethod
     def _is_public_module(file_rel_path: Path) -> bool:
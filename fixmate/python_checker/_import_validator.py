@@ -1,50 +1,91 @@
+from __future__ import annotations
+
 import ast
-from pathlib import Path
+import re
+from typing import TYPE_CHECKING
+
+from fixmate.python_checker._error_record import ErrorKind, ErrorRecord
+from fixmate.python_checker._module_index import ModuleIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
 
-from fixmate.python_checker._dto import FileSpecsDto
+    from fixmate.python_checker._dto import AstNodeDto, FileSpecsDto
 
 
 class ImportValidator:
     error_code = "import_validator"
+    node_types: tuple[type[ast.AST], ...] = (ast.Import, ast.ImportFrom)
+    _name_separator_pattern = re.compile(rb"\W+")
 
-    def validate(self, tree: ast.AST, file_specs: FileSpecsDto) -> None:
-        imports = self._find_imports(tree)
-
-        for imported_module, line in imports:
-            if self._is_private_module(imported_module) and not self._is_within_package(
-                imported_module, file_specs.rel_path
-            ):
-                error = (
-                    f"{file_specs.rel_path}:{line}: "
-                    f"invalid import of private module '{imported_module}' "
-                    f"[{self.error_code}]"
-                )
-                file_specs.errors.append(error)
+    def __init__(self, module_index: ModuleIndex | None = None) -> None:
+        self._module_index = module_index or ModuleIndex()
+
+    def may_apply(self, source: bytes, file_rel_path: Path) -> bool:
+        """Tell, without parsing, whether the source may import a private module."""
+        # Relative imports from a private package resolve to private modules without naming one
+        if self._module_index.is_private(self._module_index.get_file_package(file_rel_path)):
+            return b"import" in source
+
+        return any(
+            self._module_index.is_private(name.decode("latin-1"))
+            for import_line in self._find_import_lines(source)
+            for name in self._name_separator_pattern.split(import_line)
+        )
+
+    def _find_import_lines(self, source: bytes) -> Iterator[bytes]:
+        """Yield the lines holding the `import` keyword, joined with the lines they continue or are continued by.
+
+        Every import statement has the keyword on one of its lines, and module names only span lines through
+        backslash continuations. A plain substring search is much cheaper than a regex scan of the whole source.
+        """
+        start = source.find(b"import")
+
+        while start != -1:
+            line_start = source.rfind(b"\n", 0, start) + 1
+            while line_start > 0 and self._is_continued(source, line_start - 1):
+                line_start = source.rfind(b"\n", 0, line_start - 1) + 1
+
+            line_end = source.find(b"\n", start)
+            while line_end != -1 and self._is_continued(source, line_end):
+                line_end = source.find(b"\n", line_end + 1)
+
+            if line_end == -1:
+                line_end = len(source)
+
+            yield source[line_start:line_end]
+            start = source.find(b"import", line_end)
 
     @staticmethod
-    def _find_imports(tree: ast.AST) -> list[tuple[str, int]]:
-        """Extract imports and their line numbers from an AST node."""
+    def _is_continued(source: bytes, newline_index: int) -> bool:
+        """Tell whether the line ending at a newline ends with a backslash continuation."""
+        end = newline_index - 1 if source[newline_index - 1 : newline_index] == b"\r" else newline_index
+        return source[end - 1 : end] == b"\\"
+
+    def validate(self, nodes: list[AstNodeDto], file_specs: FileSpecsDto) -> None:
+        file_package = self._module_index.get_file_package(file_specs.rel_path)
+
+        for imported_module, line in self._find_imports(nodes, file_package):
+            imported_package, is_private = self._module_index.get_module(imported_module)
+
+            # A file may import its own package and the modules next to it
+            if is_private and file_package not in (imported_package, imported_module):
+                file_specs.errors.append(
+                    ErrorRecord(file_specs.path, line, self.error_code, ErrorKind.PRIVATE_IMPORT, imported_module)
+                )
+
+    def _find_imports(self, nodes: list[AstNodeDto], file_package: str) -> list[tuple[str, int]]:
+        """Extract imports, relative ones made absolute, and their line numbers from the import nodes."""
         imports: list[tuple[str, int]] = []
 
-        for node in ast.walk(tree):
+        for node_dto in nodes:
+            node = node_dto.node
             if isinstance(node, ast.Import):
                 imports.extend([(alias.name, node.lineno) for alias in node.names])
-            elif isinstance(node, ast.ImportFrom) and node.module:
-                imports.append((node.module, node.lineno))
+            elif isinstance(node, ast.ImportFrom):
+                imported_module = self._module_index.resolve(node.module, node.level or 0, file_package)
+                if imported_module:
+                    imports.append((imported_module, node.lineno))
 
         return imports
-
-    def _is_private_module(self, imported_module: str) -> bool:
-        parts = imported_module.split(".")
-        return any(p.startswith("_") and not self._is_magic_module_package(p) for p in parts)
-
-    @staticmethod
-    def _is_magic_module_package(module_package_name: str) -> bool:
-        return module_package_name.startswith("__") and module_package_name.endswith("__")
-
-    @staticmethod
-    def _is_within_package(imported_module: str, file_rel_path: Path) -> bool:
-        file_package = ".".join(file_rel_path.parts[:-1])  # Exclude file name
-        imported_module_parts = imported_module.split(".")
-        imported_module_package = ".".join(imported_module_parts[:-1])  # Exclude module name
-        return file_package == imported_module_package
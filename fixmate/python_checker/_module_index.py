@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+
+class ModuleIndex:
+    """Map dotted module names to their package and privacy, and project files to the package they belong to.
+
+    Each name is resolved once and then looked up, and the files of a directory share the resolution of their
+    package. A file under one of the `source_roots` is named from that root, `src/pkg/mod.py` as `pkg.mod` with
+    the `src` root, any other file from the working directory.
+    """
+
+    def __init__(self, source_roots: list[str] | None = None) -> None:
+        # Nested roots come first, so they win over the roots containing them
+        self._source_roots = sorted((Path(root).parts for root in source_roots or []), key=len, reverse=True)
+        self._modules: dict[str, tuple[str, bool]] = {}
+        self._file_packages: dict[Path, str] = {}
+
+    def get_module(self, module_name: str) -> tuple[str, bool]:
+        """Return the package of a module and whether any part of its name is private."""
+        module = self._modules.get(module_name)
+
+        if module is None:
+            parts = module_name.split(".")
+            is_private = any(part.startswith("_") and not self._is_magic_name(part) for part in parts)
+            module = self._modules[module_name] = (".".join(parts[:-1]), is_private)
+
+        return module
+
+    def is_private(self, module_name: str) -> bool:
+        return self.get_module(module_name)[1]
+
+    def get_file_package(self, file_rel_path: Path) -> str:
+        dir_rel_path = file_rel_path.parent
+        package = self._file_packages.get(dir_rel_path)
+
+        if package is None:
+            package = self._file_packages[dir_rel_path] = ".".join(self._strip_source_root(dir_rel_path.parts))
+
+        return package
+
+    @staticmethod
+    def resolve(module_name: str | None, level: int, file_package: str) -> str | None:
+        """Return the absolute name of an imported module, None when a relative import goes past the top package."""
+        if not level:
+            return module_name
+
+        package_parts = file_package.split(".") if file_package else []
+        if level > len(package_parts):
+            return None
+
+        base_parts = package_parts[: len(package_parts) - level + 1]
+        return ".".join([*base_parts, module_name] if module_name else base_parts)
+
+    def _strip_source_root(self, dir_parts: tuple[str, ...]) -> tuple[str, ...]:
+        for root_parts in self._source_roots:
+            if dir_parts[: len(root_parts)] == root_parts:
+                return dir_parts[len(root_parts) :]
+
+        return dir_parts
+
+    @staticmethod
+    def _is_magic_name(name: str) -> bool:
+        return name.startswith("__") and name.endswith("__")
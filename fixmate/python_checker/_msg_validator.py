@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import ast
+import re
 from contextlib import suppress
 from enum import Enum
 from typing import TYPE_CHECKING
 
+from fixmate.python_checker._error_record import ErrorKind, ErrorRecord
+
 if TYPE_CHECKING:
-    from fixmate.python_checker._dto import FileSpecsDto
+    from pathlib import Path
 
-_TStrVars = dict[str, tuple[str, int]]
+    from fixmate.python_checker._dto import AstNodeDto, FileSpecsDto
 
 
 class _MsgCategory(Enum):
@@ -16,89 +19,56 @@ class _MsgCategory(Enum):
     EXCEPTION = "exception"
 
 
-class MsgValidator:
-    error_code = "msg_validator"
-
-    def validate(self, tree: ast.AST, file_specs: FileSpecsDto) -> None:
-        variables = self._collect_str_vars(tree)
-
-        for node in ast.walk(tree):
-            # Check for logging calls
-            log_funcs = {"info", "debug", "error", "warning", "critical"}
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr in log_funcs:
-                self._check_node(node.args, variables, _MsgCategory.LOG, file_specs)
-
-            # Check for exception raises
-            if isinstance(node, ast.Raise) and isinstance(node.exc, ast.Call):
-                self._check_node(node.exc.args, variables, _MsgCategory.EXCEPTION, file_specs)
-
-    def _collect_str_vars(self, tree: ast.AST) -> _TStrVars:
-        """Collect variables mapped to their first assigned string constant."""
-        variables: _TStrVars = {}
-
-        for node in ast.walk(tree):
-            if not isinstance(node, ast.Assign):
-                continue
+class _StringResolver:
+    """Resolve expressions to the string they hold, through the strings assigned to names in each scope.
 
-            for target in node.targets:
-                if not isinstance(target, ast.Name):
-                    continue
+    Assignments are recorded first, then `freeze` memoizes the f-string and `%` results, as the names they
+    depend on no longer change.
+    """
 
-                key = self._unique_key(target)
-                strings = self._get_strings(node.value, variables)
+    def __init__(self) -> None:
+        self._symbols: dict[str, dict[str, tuple[str, int]]] = {}  # Scope to name to its string and line
+        self._resolved: dict[int, list[tuple[str, int]]] | None = None
 
-                if strings:
-                    variables[key] = strings[0]
+    def assign(self, target: ast.Name, value: ast.AST, scope: str) -> None:
+        strings = self.resolve(value, scope)
+        if strings:
+            self._symbols.setdefault(scope, {})[target.id] = strings[0]
 
-        return variables
+    def freeze(self) -> None:
+        self._resolved = {}
 
-    def _unique_key(self, node: ast.Name) -> str:
-        scope = self._get_scope(node)
-        return f"{scope}__{node.id}"
-
-    @staticmethod
-    def _get_scope(node: ast.Name) -> str:
-        current: ast.AST | None = node
-
-        for _ in range(10):  # Check up to limited levels
-            if current is None:
-                break
-
-            if isinstance(current, (ast.FunctionDef, ast.ClassDef, ast.AsyncFunctionDef)):
-                return current.name
-
-            current = current.parent  # type: ignore[attr-defined]
-
-        return "global"
-
-    def _get_strings(self, node: ast.AST, variables: _TStrVars | None = None) -> list[tuple[str, int]]:
+    def resolve(self, node: ast.AST, scope: str) -> list[tuple[str, int]]:
         """Extract string constants and their line numbers from an AST node."""
-        known_vars = variables or {}
-
         if isinstance(node, ast.Constant) and isinstance(node.value, str):
             return [(node.value, node.lineno)]
 
         if isinstance(node, ast.Name):
-            return self._get_name_strings(node, known_vars)
+            symbol = self._symbols.get(scope, {}).get(node.id)
+            return [symbol] if symbol else []
 
-        if isinstance(node, ast.JoinedStr):
-            resolved = self._resolve_joined_string(node, known_vars)
-            return [resolved] if resolved else []
-
-        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mod):
-            resolved = self._resolve_mod_string(node, known_vars)
-            return [resolved] if resolved else []
+        if isinstance(node, ast.JoinedStr) or (isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mod)):
+            return self._resolve_formatted(node, scope)
 
         return []
 
-    def _get_name_strings(self, node: ast.Name, variables: _TStrVars) -> list[tuple[str, int]]:
-        key = self._unique_key(node)
-        if key in variables:
-            return [variables[key]]
+    def _resolve_formatted(self, node: ast.JoinedStr | ast.BinOp, scope: str) -> list[tuple[str, int]]:
+        if self._resolved is not None and id(node) in self._resolved:
+            return self._resolved[id(node)]
 
-        return []
+        if isinstance(node, ast.JoinedStr):
+            resolved = self._resolve_joined_string(node, scope)
+        else:
+            resolved = self._resolve_mod_string(node, scope)
+
+        strings = [resolved] if resolved else []
+
+        if self._resolved is not None:
+            self._resolved[id(node)] = strings
 
-    def _resolve_joined_string(self, node: ast.JoinedStr, variables: _TStrVars) -> tuple[str, int] | None:
+        return strings
+
+    def _resolve_joined_string(self, node: ast.JoinedStr, scope: str) -> tuple[str, int] | None:
         value_parts: list[str] = []
         line = node.lineno
 
@@ -111,7 +81,7 @@ class MsgValidator:
             if not isinstance(part, ast.FormattedValue):
                 continue
 
-            nested = self._get_strings(part.value, variables)
+            nested = self.resolve(part.value, scope)
             if nested:
                 value_parts.append(nested[0][0])
                 line = nested[0][1]
@@ -121,13 +91,13 @@ class MsgValidator:
 
         return ("".join(value_parts), line)
 
-    def _resolve_mod_string(self, node: ast.BinOp, variables: _TStrVars) -> tuple[str, int] | None:
-        left_strings = self._get_strings(node.left, variables)
+    def _resolve_mod_string(self, node: ast.BinOp, scope: str) -> tuple[str, int] | None:
+        left_strings = self.resolve(node.left, scope)
         if not left_strings:
             return None
 
         fmt, fmt_line = left_strings[0]
-        right_value = self._resolve_mod_value(node.right, variables)
+        right_value = self._resolve_mod_value(node.right, scope)
         if right_value is None:
             return None
 
@@ -136,43 +106,86 @@ class MsgValidator:
 
         return None
 
-    def _resolve_mod_value(self, node: ast.AST, variables: _TStrVars) -> str | tuple[str, ...] | None:
+    def _resolve_mod_value(self, node: ast.AST, scope: str) -> str | tuple[str, ...] | None:
         if isinstance(node, ast.Tuple):
             items: list[str] = []
             for item in node.elts:
-                values = self._get_strings(item, variables)
+                values = self.resolve(item, scope)
                 if not values:
                     return None
                 items.append(values[0][0])
             return tuple(items)
 
-        values = self._get_strings(node, variables)
+        values = self.resolve(node, scope)
         if values:
             return values[0][0]
 
         return None
 
+
+class MsgValidator:
+    error_code = "msg_validator"
+    node_types: tuple[type[ast.AST], ...] = (ast.Assign, ast.Call, ast.Raise)
+    _log_funcs = frozenset(("info", "debug", "error", "warning", "critical"))
+    _keyword_pattern = re.compile(rb"\b(?:raise|" + b"|".join(f.encode() for f in sorted(_log_funcs)) + rb")\b")
+
+    def may_apply(self, source: bytes, file_rel_path: Path) -> bool:  # noqa: ARG002
+        """Tell, without parsing, whether the source may raise an exception or call a log method."""
+        return self._keyword_pattern.search(source) is not None
+
+    def validate(self, nodes: list[AstNodeDto], file_specs: FileSpecsDto) -> None:
+        resolver = _StringResolver()
+        messages: list[tuple[list[ast.expr], str, _MsgCategory]] = []
+
+        # A single pass records the assignments and finds the messages, which are checked once every name is known
+        for node_dto in nodes:
+            node = node_dto.node
+
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        resolver.assign(target, node.value, node_dto.scope)
+
+            # Check for logging calls
+            elif (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr in self._log_funcs
+            ):
+                messages.append((node.args, node_dto.scope, _MsgCategory.LOG))
+
+            # Check for exception raises
+            elif isinstance(node, ast.Raise) and isinstance(node.exc, ast.Call):
+                messages.append((node.exc.args, node_dto.scope, _MsgCategory.EXCEPTION))
+
+        resolver.freeze()
+
+        for args, scope, category in messages:
+            self._check_node(args, resolver, scope, category, file_specs)
+
     def _check_node(
-        self, args: list[ast.expr], variables: _TStrVars, category: _MsgCategory, file_specs: FileSpecsDto
+        self,
+        args: list[ast.expr],
+        resolver: _StringResolver,
+        scope: str,
+        category: _MsgCategory,
+        file_specs: FileSpecsDto,
     ) -> None:
         for arg in args:
-            strings = self._get_strings(arg, variables)
-
-            file_rel_path = file_specs.rel_path
-            cat_name = category.value
+            strings = resolver.resolve(arg, scope)
 
             for string, line in strings:
                 if category == _MsgCategory.LOG and self._starts_with_lowercase(string):
-                    error = f"{file_rel_path}:{line}: {cat_name} '{string}' starts with lowercase [{self.error_code}]"
-                    file_specs.errors.append(error)
+                    self._add_error(file_specs, line, ErrorKind.LOG_LOWERCASE, string)
 
                 if category == _MsgCategory.EXCEPTION and self._starts_with_uppercase(string):
-                    error = f"{file_rel_path}:{line}: {cat_name} '{string}' starts with uppercase [{self.error_code}]"
-                    file_specs.errors.append(error)
+                    self._add_error(file_specs, line, ErrorKind.EXCEPTION_UPPERCASE, string)
 
                 if category == _MsgCategory.EXCEPTION and self._ends_with_punctuation(string):
-                    error = f"{file_rel_path}:{line}: {cat_name} '{string}' ends with punctuation [{self.error_code}]"
-                    file_specs.errors.append(error)
+                    self._add_error(file_specs, line, ErrorKind.EXCEPTION_PUNCTUATION, string)
+
+    def _add_error(self, file_specs: FileSpecsDto, line: int, kind: ErrorKind, string: str) -> None:
+        file_specs.errors.append(ErrorRecord(file_specs.path, line, self.error_code, kind, string))
 
     def _starts_with_uppercase(self, string: str) -> bool:
         return bool(string) and string[0].isalpha() and string[0].isupper()
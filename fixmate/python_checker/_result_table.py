@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from fixmate.python_checker._error_record import ErrorRecord
+
+_TSignature = tuple[int, int]
+
+
+class ResultTable:
+    """Keep each file's errors in memory until the file's mtime or size changes."""
+
+    def __init__(self) -> None:
+        self._results: dict[Path, tuple[_TSignature, list[ErrorRecord]]] = {}
+
+    def lookup(self, file_abs_path: Path) -> tuple[_TSignature | None, list[ErrorRecord] | None]:
+        """Return the current signature of the file and its remembered errors, if still valid."""
+        try:
+            stat = file_abs_path.stat()
+        except OSError:
+            return None, None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        known_result = self._results.get(file_abs_path)
+
+        if known_result and known_result[0] == signature:
+            return signature, known_result[1]
+
+        return signature, None
+
+    def store(self, file_abs_path: Path, signature: _TSignature | None, errors: list[ErrorRecord]) -> None:
+        if signature:
+            self._results[file_abs_path] = (signature, errors)
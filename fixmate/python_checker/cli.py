@@ -1,8 +1,14 @@
 import argparse
+import logging
+from contextlib import closing
 from pathlib import Path
 
 from fixmate.helpers.logger import setup_logger
-from fixmate.python_checker.python_checker import PythonChecker
+from fixmate.helpers.reporter import parse_max_errors, report_errors
+from fixmate.python_checker._daemon_client import DaemonClient
+from fixmate.python_checker._error_record import ErrorRecord
+
+_logger = logging.getLogger(__name__)
 
 
 def main() -> None:
@@ -10,10 +16,80 @@ def main() -> None:
 
     parser = argparse.ArgumentParser(description="Python code checker")
     parser.add_argument("--config", type=Path, help="Path to pyproject.toml file")
+    parser.add_argument("--jobs", type=int, help="Number of worker processes (default: CPU count)")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Do not read or write the result cache (implies --no-daemon)"
+    )
+    parser.add_argument("--no-daemon", action="store_true", help="Check in-process even when a daemon is running")
+    parser.add_argument("--walk-threads", type=int, default=1, help="Threads listing directories concurrently")
+    parser.add_argument("--changed-since", metavar="REF", help="Only check files changed since this git ref")
+    parser.add_argument("--watch", action="store_true", help="Re-check changed paths until interrupted")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between two polls in watch mode")
+    parser.add_argument("--max-errors", type=parse_max_errors, metavar="N", help="Stop once N errors were reported")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop at the first error (same as --max-errors 1)")
+    parser.add_argument(
+        "--format", choices=["text", "jsonl"], default="text", help="Print errors as text or as JSON lines"
+    )
+    parser.add_argument("--stats", action="store_true", help="Print timings per phase and validator")
+    parser.add_argument(
+        "--stats-format", choices=["table", "json"], default="table", help="Print the timings as a table or as JSON"
+    )
+    parser.add_argument("--daemon", action="store_true", help="Stay resident and serve checks to later invocations")
     parser.add_argument("files", nargs="*", help="Files to check (optional)")
     args = parser.parse_args()
+    max_errors = 1 if args.fail_fast else args.max_errors
+
+    # Each command only imports what it runs, hooks are called often on small batches and startup adds up
+    if args.daemon:
+        from fixmate.python_checker._daemon_server import DaemonServer
+
+        DaemonServer(config_path=args.config, jobs=args.jobs).serve()
+        return
+
+    if args.watch:
+        from fixmate.python_checker.python_checker import PythonChecker
+
+        PythonChecker(
+            config_path=args.config,
+            jobs=args.jobs,
+            use_cache=not args.no_cache,
+            keep_results=True,
+            walk_threads=args.walk_threads,
+        ).watch(interval=args.interval)
+        return
+
+    formatter = ErrorRecord.get_formatter(args.format)
+
+    # Timings are only collected in-process, a daemon would answer without them, and from its caches
+    if not args.no_daemon and not args.no_cache and not args.stats:
+        daemon_errors = DaemonClient().check(args.files, args.config, args.changed_since)
+        if daemon_errors is not None:
+            report_errors(daemon_errors, _logger, max_errors, formatter=formatter)
+
+    from fixmate.python_checker.python_checker import PythonChecker
+
+    stats = None
+
+    if args.stats:
+        from fixmate.helpers.stats_recorder import StatsRecorder
+
+        stats = StatsRecorder()
+
+    checker = PythonChecker(
+        config_path=args.config,
+        jobs=args.jobs,
+        use_cache=not args.no_cache,
+        walk_threads=args.walk_threads,
+        stats=stats,
+    )
 
-    PythonChecker(config_path=args.config).run(files_to_check=args.files)
+    try:
+        # Closing the stream once the error budget is spent stops scheduling files that are not started yet
+        with closing(checker.iter_errors(args.files, args.changed_since)) as errors:
+            report_errors(errors, _logger, max_errors, formatter=formatter)
+    finally:
+        if stats:
+            stats.log_summary(_logger, args.stats_format)
 
 
 if __name__ == "__main__":
@@ -1,118 +1,417 @@
 from __future__ import annotations
 
 import ast
-import fnmatch
 import logging
 import os
+import sys
+import time
+from collections import deque
+from contextlib import AbstractContextManager, closing, nullcontext
+from itertools import chain, islice
 from pathlib import Path
-from typing import NoReturn
+from typing import TYPE_CHECKING, Optional
 
 from fixmate.helpers.config_loader import load_configs
 from fixmate.helpers.dir_tools import is_blacklisted_dir, is_hidden_dir
-from fixmate.python_checker._dto import FileSpecsDto
+from fixmate.helpers.git_tools import get_changed_paths
+from fixmate.helpers.ignore_matcher import IgnoreMatcher
+from fixmate.helpers.reporter import log_errors
+from fixmate.helpers.result_cache import ResultCache
+from fixmate.helpers.tree_walker import TreeWalker
+from fixmate.python_checker._ast_dispatcher import AstDispatcher, AstValidator
+from fixmate.python_checker._dto import FileResultDto, FileSpecsDto
+from fixmate.python_checker._error_record import ErrorKind, ErrorRecord
 from fixmate.python_checker._func_validator import FuncValidator
 from fixmate.python_checker._import_validator import ImportValidator
+from fixmate.python_checker._module_index import ModuleIndex
 from fixmate.python_checker._msg_validator import MsgValidator
+from fixmate.python_checker._result_table import ResultTable
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable, Iterator, Mapping
+    from concurrent.futures import Future
+
+    from fixmate.helpers.stats_recorder import StatsRecorder
+
+    _TChunkResult = tuple[list[list[ErrorRecord]], Optional[StatsRecorder]]
+
+_TKnownResult = tuple[Optional[tuple[int, int]], Optional[list[ErrorRecord]]]
 
 
 class PythonChecker:
-    def __init__(self, config_path: Path | None = None) -> None:
+    _chunk_size = 32
+    _cache_max_age = 30 * 24 * 60 * 60
+
+    def __init__(  # noqa: PLR0913
+        self,
+        config_path: Path | None = None,
+        *,
+        configs: dict | None = None,
+        jobs: int | None = None,
+        use_cache: bool = True,
+        keep_results: bool = False,
+        walk_threads: int = 1,
+        stats: StatsRecorder | None = None,
+    ) -> None:
         config_path = config_path or Path("pyproject.toml")
-        self._configs = load_configs(config_path, "python_checker")
-        self._ignore_rules = self._load_ignore_rules()
+        self._configs = (
+            configs if configs is not None else load_configs(config_path, "python_checker", use_cache=use_cache)
+        )
+        self._jobs = max(jobs or os.cpu_count() or 1, 1)
+        self._walker = TreeWalker(self.should_check_dir, threads=walk_threads)
+        self._cache = ResultCache(Path.cwd(), "python_checker", max_age=self._cache_max_age) if use_cache else None
+        self._result_table = ResultTable() if keep_results else None
+        self._stats = stats
+        self._ignore_matcher = IgnoreMatcher(self._load_ignore_rules())
         self._msg_validator = MsgValidator()
-        self._import_validator = ImportValidator()
+        self._module_index = ModuleIndex(self._configs.get("source-roots"))
+        self._import_validator = ImportValidator(self._module_index)
         self._func_validator = FuncValidator()
+        self._dispatcher = AstDispatcher()
         self._logger = logging.getLogger(__name__)
 
-    def run(self, files_to_check: list[str] | None = None) -> NoReturn:
-        files_to_check = files_to_check or []
+    def __getstate__(self) -> dict:
+        # Worker processes never need the in-memory results, so they are not pickled with each chunk
+        state = self.__dict__.copy()
+        state["_result_table"] = None
+        # Each chunk sends back the stats of its own files only, the parent merges them into its recorder
+        state["_stats"] = self._stats.fork() if self._stats else None
+        return state
+
+    def watch(self, interval: float = 1.0) -> None:
+        """Check the whole tree, then re-validate the files that change and print the current errors."""
         exec_abs_path = Path.cwd()
-        errors = self._validate_files(exec_abs_path, files_to_check)
+        from fixmate.helpers.poll_watcher import PollWatcher
+
+        watcher = PollWatcher(self.should_check_dir, interval=interval)
+        with closing(self.check_paths(self._iter_all_files(exec_abs_path), exec_abs_path)) as results:
+            file_errors = dict(results)
+        self._log_watched_errors(file_errors)
 
-        if errors:
-            for error in errors:
-                self._logger.error(error)
-            raise SystemExit(1)
+        try:
+            for changed_paths in watcher.watch([exec_abs_path]):
+                changed_files = sorted(path for path in changed_paths if self.should_check_file(path.name))
+                if not changed_files:
+                    continue
 
-        self._logger.info("All checks passed")
-        raise SystemExit(0)
+                for file_abs_path in changed_files:
+                    file_errors.pop(file_abs_path, None)
+                    if file_abs_path.is_file():
+                        file_errors[file_abs_path] = self._check_watched_file(file_abs_path, exec_abs_path)
 
-    def _validate_files(self, exec_abs_path: Path, files_to_check: list[str]) -> list[str]:
-        errors: list[str] = []
+                self._log_watched_errors(file_errors)
+        except KeyboardInterrupt:
+            self._logger.info("Stopped watching")
+
+    def check(self, files_to_check: list[str] | None = None, changed_since: str | None = None) -> list[ErrorRecord]:
+        return list(self.iter_errors(files_to_check, changed_since))
+
+    def iter_errors(
+        self, files_to_check: list[str] | None = None, changed_since: str | None = None
+    ) -> Generator[ErrorRecord, None, None]:
+        """Yield errors as soon as the file they belong to is validated, while the walk is still going on."""
+        exec_abs_path = Path.cwd()
+        file_abs_paths: list[Path] | None = None
 
         if files_to_check:
-            file_abs_paths = [exec_abs_path / f for f in files_to_check]
-        else:
-            file_abs_paths = self._get_all_files(exec_abs_path)
+            file_abs_paths = sorted(exec_abs_path / f for f in files_to_check)
+        elif changed_since:
+            with self._measure("git"):
+                changed_files = self._get_changed_files(exec_abs_path, changed_since)
+            file_abs_paths = sorted(changed_files) if changed_files is not None else None
 
-        for file_abs_path in file_abs_paths:
-            file_rel_path = file_abs_path.relative_to(exec_abs_path)
-            errors.extend(self._validate_file(file_abs_path, file_rel_path, exec_abs_path))
+        with closing(self.check_files(file_abs_paths, root=exec_abs_path)) as results:
+            for result in results:
+                yield from result.errors
 
-        return errors
+    def check_files(
+        self,
+        paths: Iterable[Path | str] | None = None,
+        *,
+        root: Path | None = None,
+        sources: Mapping[Path | str, str | bytes] | None = None,
+    ) -> Generator[FileResultDto, None, None]:
+        """Validate files and yield a result per file, in the order of `paths`, or of the walk when it is None.
+
+        Relative paths are taken from `root`, the current directory by default. Files whose content is given in
+        `sources`, keyed like `paths`, are validated from it instead of being read. Nothing is logged and nothing
+        exits, so the same checker can serve any number of calls in one process.
+        """
+        root_abs_path = Path.cwd() / root if root else Path.cwd()
+        source_bytes = {
+            root_abs_path / path: source.encode() if isinstance(source, str) else source
+            for path, source in (sources or {}).items()
+        }
 
-    def _get_all_files(self, exec_abs_path: Path) -> list[Path]:
-        all_files = []
+        file_abs_paths: Iterable[Path]
+        if paths is None:
+            file_abs_paths = self._iter_all_files(root_abs_path)
+            if self._stats:
+                file_abs_paths = self._stats.time_iter("walk", file_abs_paths)
+        else:
+            file_abs_paths = (root_abs_path / path for path in paths)
 
-        for root_path, dir_names, file_names in os.walk(exec_abs_path):
-            dir_names[:] = [d for d in dir_names if self._should_check_dir(d)]
+        with closing(self.check_paths(file_abs_paths, root_abs_path, source_bytes)) as results:
+            for file_abs_path, file_errors in results:
+                yield FileResultDto(rel_path=file_abs_path.relative_to(root_abs_path), errors=file_errors)
 
-            for file_name in file_names:
-                if self._should_check_file(file_name):
-                    file_abs_path = Path(root_path) / file_name
-                    all_files.append(file_abs_path)
+    def check_paths(
+        self, file_abs_paths: Iterable[Path], exec_abs_path: Path, sources: Mapping[Path, bytes] | None = None
+    ) -> Generator[tuple[Path, list[ErrorRecord]], None, None]:
+        """Validate files as their paths come in, yielding each path with its errors in the same order."""
+        sources = sources or {}
+        remaining_abs_paths = iter(file_abs_paths)
+        first_chunks = list(islice(remaining_abs_paths, self._chunk_size * 2))
+        all_abs_paths = chain(first_chunks, remaining_abs_paths)
 
-        return all_files
+        try:
+            # Pool startup costs more than validating a handful of files in-process
+            if self._jobs > 1 and len(first_chunks) == self._chunk_size * 2:
+                yield from self._validate_in_pool(all_abs_paths, exec_abs_path, sources)
+            else:
+                for file_abs_path in all_abs_paths:
+                    chunk = [file_abs_path]
+                    known_results = self._lookup_known_results(chunk, sources)
+                    pending_abs_paths = [p for p, (_, errors) in zip(chunk, known_results) if errors is None]
+                    pending_errors = self._validate_chunk(pending_abs_paths, exec_abs_path, sources)
+                    yield from self._merge_results(chunk, known_results, pending_errors)
+        finally:
+            if self._cache:
+                self._cache.evict()
 
-    def _should_check_dir(self, dir_name: str) -> bool:
+    def should_check_dir(self, dir_name: str) -> bool:
         return not is_hidden_dir(dir_name) and not is_blacklisted_dir(dir_name)
 
-    def _should_check_file(self, file_name: str) -> bool:
+    def should_check_file(self, file_name: str) -> bool:
         return file_name.endswith(".py")
 
-    def _validate_file(self, file_abs_path: Path, file_rel_path: Path, exec_abs_path: Path) -> list[str]:
-        with file_abs_path.open() as f:
-            tree = ast.parse(f.read(), filename=str(file_abs_path))
+    def _check_watched_file(self, file_abs_path: Path, exec_abs_path: Path) -> list[ErrorRecord]:
+        with closing(self.check_paths([file_abs_path], exec_abs_path)) as results:
+            return next(results)[1]
+
+    def _log_watched_errors(self, file_errors: dict[Path, list[ErrorRecord]]) -> None:
+        errors = (error for file_abs_path in sorted(file_errors) for error in file_errors[file_abs_path])
+
+        if log_errors(errors, self._logger):
+            self._logger.info("Watching for changes, press Ctrl+C to stop")
+        else:
+            self._logger.info("All checks passed, watching for changes, press Ctrl+C to stop")
+
+    def _validate_in_pool(
+        self, file_abs_paths: Iterator[Path], exec_abs_path: Path, sources: Mapping[Path, bytes]
+    ) -> Iterator[tuple[Path, list[ErrorRecord]]]:
+        # Small batches, like those of a pre-commit run, never start a pool and skip the multiprocessing imports
+        from concurrent.futures import ProcessPoolExecutor
+
+        in_flight: deque[tuple[list[Path], list[_TKnownResult], Future[_TChunkResult]]] = deque()
+
+        with ProcessPoolExecutor(max_workers=self._jobs) as executor:
+            try:
+                while True:
+                    chunk = list(islice(file_abs_paths, self._chunk_size))
+                    if not chunk:
+                        break
+
+                    known_results = self._lookup_known_results(chunk, sources)
+                    pending_abs_paths = [p for p, (_, errors) in zip(chunk, known_results) if errors is None]
+                    # Only the sources of the chunk's own files are sent along with it
+                    chunk_sources = {p: sources[p] for p in pending_abs_paths if p in sources}
+                    future = executor.submit(
+                        self._validate_chunk_in_worker, pending_abs_paths, exec_abs_path, chunk_sources
+                    )
+                    in_flight.append((chunk, known_results, future))
+
+                    # Bounding the submitted chunks keeps memory flat however many paths the input yields
+                    if len(in_flight) > self._jobs * 2:
+                        chunk, known_results, future = in_flight.popleft()
+                        yield from self._merge_results(chunk, known_results, self._collect_chunk(future))
+
+                while in_flight:
+                    chunk, known_results, future = in_flight.popleft()
+                    yield from self._merge_results(chunk, known_results, self._collect_chunk(future))
+            finally:
+                # When the consumer stops early, the chunks still queued are dropped instead of waited for
+                for _, _, future in in_flight:
+                    future.cancel()
+
+    def _collect_chunk(self, future: Future[_TChunkResult]) -> list[list[ErrorRecord]]:
+        chunk_errors, chunk_stats = future.result()
+
+        if self._stats and chunk_stats:
+            self._stats.merge(chunk_stats)
+
+        return chunk_errors
+
+    def _lookup_known_results(self, file_abs_paths: list[Path], sources: Mapping[Path, bytes]) -> list[_TKnownResult]:
+        if not self._result_table:
+            return [(None, None)] * len(file_abs_paths)
+
+        # In-memory sources may differ from the files on disk, which the remembered results are about
+        return [
+            (None, None) if file_abs_path in sources else self._result_table.lookup(file_abs_path)
+            for file_abs_path in file_abs_paths
+        ]
+
+    def _merge_results(
+        self, file_abs_paths: list[Path], known_results: list[_TKnownResult], pending_errors: list[list[ErrorRecord]]
+    ) -> Iterator[tuple[Path, list[ErrorRecord]]]:
+        remaining_errors = iter(pending_errors)
+
+        for file_abs_path, (signature, known_errors) in zip(file_abs_paths, known_results):
+            if known_errors is not None:
+                yield file_abs_path, known_errors
+                continue
+
+            file_errors = next(remaining_errors)
+            if self._result_table:
+                self._result_table.store(file_abs_path, signature, file_errors)
+
+            yield file_abs_path, file_errors
+
+    def _validate_chunk(
+        self, file_abs_paths: list[Path], exec_abs_path: Path, sources: Mapping[Path, bytes]
+    ) -> list[list[ErrorRecord]]:
+        return [
+            self._validate_file(file_abs_path, file_abs_path.relative_to(exec_abs_path), sources.get(file_abs_path))
+            for file_abs_path in file_abs_paths
+        ]
+
+    def _validate_chunk_in_worker(
+        self, file_abs_paths: list[Path], exec_abs_path: Path, sources: Mapping[Path, bytes]
+    ) -> _TChunkResult:
+        return self._validate_chunk(file_abs_paths, exec_abs_path, sources), self._stats
+
+    def _get_changed_files(self, exec_abs_path: Path, changed_since: str) -> list[Path] | None:
+        changed_paths = get_changed_paths(changed_since)
+
+        if changed_paths is None:
+            self._logger.warning("Could not list the changes since '%s', checking all files", changed_since)
+            return None
+
+        changed_files = []
+
+        for path_str in changed_paths[0]:
+            file_rel_path = Path(path_str)
+            file_abs_path = exec_abs_path / file_rel_path
+            is_dir_checked = all(self.should_check_dir(d) for d in file_rel_path.parent.parts)
+
+            if is_dir_checked and self.should_check_file(file_rel_path.name) and file_abs_path.is_file():
+                changed_files.append(file_abs_path)
+
+        return changed_files
+
+    def _iter_all_files(self, exec_abs_path: Path) -> Iterator[Path]:
+        for dir_abs_path, dir_snapshot, _ in self._walker.walk(exec_abs_path):
+            for file_name in sorted(dir_snapshot.file_names):
+                if self.should_check_file(file_name):
+                    yield dir_abs_path / file_name
+
+    def _validate_file(self, file_abs_path: Path, file_rel_path: Path, source: bytes | None) -> list[ErrorRecord]:
+        if not self._stats:
+            return self._validate_file_content(file_abs_path, file_rel_path, source)
+
+        start = time.perf_counter()
+        errors = self._validate_file_content(file_abs_path, file_rel_path, source)
+        self._stats.record_path(str(file_rel_path), time.perf_counter() - start)
+        return errors
+
+    def _validate_file_content(
+        self, file_abs_path: Path, file_rel_path: Path, source: bytes | None
+    ) -> list[ErrorRecord]:
+        ignored_validators = self._get_ignored_validators(file_rel_path)
+        validators = self._get_enabled_validators(ignored_validators)
+
+        # Files every validator is ignored for are not even read
+        if not validators:
+            return []
+
+        if source is None:
+            with self._measure("read"):
+                source = file_abs_path.read_bytes()
+
+        # Parsing is the bulk of the work, it is skipped when no validator could flag anything in the source
+        with self._measure("prefilter"):
+            validators = [validator for validator in validators if validator.may_apply(source, file_rel_path)]
+
+        if not validators:
+            return []
+
+        cache_key = ""
+
+        if self._cache:
+            with self._measure("cache"):
+                # The package is what imports are resolved against, it changes with the source roots
+                file_package = self._module_index.get_file_package(file_rel_path)
+                cache_key = self._cache.make_key(str(file_rel_path), file_package, *sorted(ignored_validators), source)
+                cached_errors = self._load_cached_errors(cache_key)
+            if cached_errors is not None:
+                return cached_errors
+
+        with self._measure("parse"):
+            try:
+                tree = ast.parse(source, filename=str(file_abs_path))
+            except (SyntaxError, ValueError) as e:
+                # An unparsable file, often one saved half-written, is reported instead of ending the whole run
+                return [self._make_syntax_error(file_rel_path, e)]
+
+        file_specs = FileSpecsDto(rel_path=file_rel_path, path=sys.intern(str(file_rel_path)), errors=[])
+        self._run_validators(tree, file_specs, validators)
+
+        if self._cache:
+            with self._measure("cache"):
+                self._cache.set(cache_key, [error.to_row() for error in file_specs.errors])
 
-        self._set_parents(tree)
-        file_specs = FileSpecsDto(
-            exec_abs_path=exec_abs_path, abs_path=file_abs_path, rel_path=file_rel_path, errors=[]
-        )
-        self._run_validators(tree, file_specs)
         return file_specs.errors
 
-    def _run_validators(self, tree: ast.AST, file_specs: FileSpecsDto) -> None:
-        ignored_validators = self._get_ignored_validators(file_specs.rel_path)
+    @staticmethod
+    def _make_syntax_error(file_rel_path: Path, error: SyntaxError | ValueError) -> ErrorRecord:
+        # Sources with null bytes raise a ValueError, without a line, on the Python versions before 3.12
+        if isinstance(error, SyntaxError):
+            return ErrorRecord(str(file_rel_path), error.lineno or 0, "", ErrorKind.INVALID_SYNTAX, error.msg)
 
-        if "all" in ignored_validators:
-            return
+        return ErrorRecord(str(file_rel_path), 0, "", ErrorKind.INVALID_SYNTAX, str(error))
 
-        if self._import_validator.error_code not in ignored_validators:
-            self._import_validator.validate(tree, file_specs)
+    def _load_cached_errors(self, cache_key: str) -> list[ErrorRecord] | None:
+        if not self._cache:
+            return None
 
-        if self._msg_validator.error_code not in ignored_validators:
-            self._msg_validator.validate(tree, file_specs)
+        rows = self._cache.get(cache_key)
+        if rows is None:
+            return None
 
-        if self._func_validator.error_code not in ignored_validators:
-            self._func_validator.validate(tree, file_specs)
+        # Entries written in another format are treated as missing and overwritten once the file is validated
+        try:
+            return [ErrorRecord.from_row(row) for row in rows]
+        except (TypeError, ValueError, KeyError):
+            return None
 
-    def _get_ignored_validators(self, file_rel_path: Path) -> list[str]:
-        """Return validators to ignore for a given file."""
-        all_ignored_validators = []
-        file_rel_str = str(file_rel_path)
+    def _get_enabled_validators(self, ignored_validators: set[str]) -> list[AstValidator]:
+        if "all" in ignored_validators:
+            return []
+
+        return [
+            validator
+            for validator in (self._import_validator, self._msg_validator, self._func_validator)
+            if validator.error_code not in ignored_validators
+        ]
 
-        for ignored_path_str, ignored_validators in self._ignore_rules.items():
-            if fnmatch.fnmatch(file_rel_str, ignored_path_str) or file_rel_str.startswith(ignored_path_str):
-                all_ignored_validators.extend(ignored_validators)
+    def _run_validators(self, tree: ast.AST, file_specs: FileSpecsDto, validators: list[AstValidator]) -> None:
+        with self._measure("dispatch"):
+            buckets = self._dispatcher.dispatch(tree, validators)
 
-        return all_ignored_validators
+        for validator, nodes in zip(validators, buckets):
+            with self._measure_validator(validator.error_code):
+                validator.validate(nodes, file_specs)
 
-    def _set_parents(self, node: ast.AST, parent: ast.AST | None = None) -> None:
-        """Recursively set parent attributes for AST nodes."""
-        node.parent = parent  # type: ignore[attr-defined]
-        for child in ast.iter_child_nodes(node):
-            self._set_parents(child, node)
+    def _measure(self, phase: str) -> AbstractContextManager[None]:
+        return self._stats.phase(phase) if self._stats else nullcontext()
+
+    def _measure_validator(self, error_code: str) -> AbstractContextManager[None]:
+        return self._stats.validator(error_code) if self._stats else nullcontext()
+
+    def _get_ignored_validators(self, file_rel_path: Path) -> set[str]:
+        """Return validators to ignore for a given file."""
+        return self._ignore_matcher.match(file_rel_path)
 
     def _load_ignore_rules(self) -> dict[str, list[str]]:
         return self._configs.get("per-file-ignores", {})
@@ -0,0 +1,35 @@
+import argparse
+from pathlib import Path
+
+from fixmate.helpers.logger import setup_logger
+from fixmate.helpers.reporter import parse_max_errors
+from fixmate.unified_checker.unified_checker import UnifiedChecker
+
+
+def main() -> None:
+    setup_logger()
+
+    parser = argparse.ArgumentParser(description="Fixmate, your project's best mate for checking and fixing code")
+    sub_parsers = parser.add_subparsers(dest="command", required=True)
+
+    check_parser = sub_parsers.add_parser("check", help="Run dir_checker and python_checker in a single pass")
+    check_parser.add_argument("--config", type=Path, help="Path to pyproject.toml file")
+    check_parser.add_argument("--jobs", type=int, help="Number of worker processes (default: CPU count)")
+    check_parser.add_argument("--no-cache", action="store_true", help="Do not read or write the result cache")
+    check_parser.add_argument("--walk-threads", type=int, default=1, help="Threads listing directories concurrently")
+    check_parser.add_argument(
+        "--max-errors", type=parse_max_errors, metavar="N", help="Stop once N errors were reported"
+    )
+    check_parser.add_argument(
+        "--fail-fast", action="store_true", help="Stop at the first error (same as --max-errors 1)"
+    )
+    args = parser.parse_args()
+    max_errors = 1 if args.fail_fast else args.max_errors
+
+    UnifiedChecker(
+        config_path=args.config, jobs=args.jobs, use_cache=not args.no_cache, walk_threads=args.walk_threads
+    ).run(max_errors=max_errors)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import logging
+from contextlib import closing
+from pathlib import Path
+from typing import TYPE_CHECKING, NoReturn
+
+from fixmate.dir_checker.dir_checker import DirChecker
+from fixmate.helpers.config_loader import load_tool_configs
+from fixmate.helpers.reporter import report_errors
+from fixmate.helpers.tree_walker import TreeWalker
+from fixmate.python_checker.python_checker import PythonChecker
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+class UnifiedChecker:
+    """Run `dir_checker` and `python_checker` together off a single walk of the tree."""
+
+    def __init__(
+        self, config_path: Path | None = None, *, jobs: int | None = None, use_cache: bool = True, walk_threads: int = 1
+    ) -> None:
+        config_path = config_path or Path("pyproject.toml")
+        tool_configs = load_tool_configs(config_path, use_cache=use_cache)
+        self._dir_checker = DirChecker(configs=tool_configs.get("dir_checker", {}))
+        self._python_checker = PythonChecker(
+            configs=tool_configs.get("python_checker", {}), jobs=jobs, use_cache=use_cache
+        )
+        self._walker = TreeWalker(self._dir_checker.should_check_dir, threads=walk_threads, include_symlinks=True)
+        self._logger = logging.getLogger(__name__)
+
+    def run(self, max_errors: int | None = None) -> NoReturn:
+        # Closing the stream once the error budget is spent stops the walk and drops the chunks not validated yet
+        with closing(self.iter_errors()) as errors:
+            report_errors(errors, self._logger, max_errors)
+
+    def iter_errors(self) -> Generator[object, None, None]:
+        """Yield the errors of directories as the walk reaches them, and those of python files once validated.
+
+        Directory errors are strings and python ones records, both only meant to be printed with `str`.
+        """
+        exec_abs_path = Path.cwd()
+        dir_errors: list[str] = []
+
+        # Python files are validated by the worker processes while the walk carries on with the directories
+        with closing(self._walk(exec_abs_path, dir_errors)) as python_files:  # noqa: SIM117
+            with closing(self._python_checker.check_paths(python_files, exec_abs_path)) as python_results:
+                for _, file_errors in python_results:
+                    # The walk runs ahead of the validation, so the directories it went through come first
+                    yield from dir_errors
+                    dir_errors.clear()
+                    yield from file_errors
+
+        yield from dir_errors
+
+    def _walk(self, exec_abs_path: Path, dir_errors: list[str]) -> Generator[Path, None, None]:
+        """Validate each directory on the way and yield the python files to check."""
+        for dir_abs_path, dir_snapshot, is_symlink in self._walker.walk(exec_abs_path):
+            dir_errors.extend(self._dir_checker.check_dir(dir_abs_path, exec_abs_path, dir_snapshot))
+
+            # Links to directories are checked themselves, but like a plain python_checker run, not their files
+            if is_symlink:
+                continue
+
+            for file_name in sorted(dir_snapshot.file_names):
+                if self._python_checker.should_check_file(file_name):
+                    yield dir_abs_path / file_name